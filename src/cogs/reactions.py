@@ -301,7 +301,9 @@ Respond ONLY with the JSON format specified above. Do not include any other text
                     model=self.bot.config['ai']['default_model'],  # Use the same model as the bot
                     messages=[{"role": "user", "content": prompt}],
                     temperature=0.7,
-                    max_tokens=500  # Increased token limit to prevent MAX_TOKENS finish reason
+                    max_tokens=500,  # Increased token limit to prevent MAX_TOKENS finish reason
+                    timeout=30,  # Reaction decisions shouldn't stall the handler
+                    num_retries=2
                 )
                 logger.debug("AI response received")
                 
@@ -509,7 +511,9 @@ IMPORTANT: For custom emoji names, use ONLY the name part (e.g., "jakeylook"), n
                     model=self.bot.config['ai']['default_model'],  # Use the same model as the bot
                     messages=[{"role": "user", "content": prompt}],
                     temperature=0.7,
-                    max_tokens=300
+                    max_tokens=300,
+                    timeout=30,
+                    num_retries=2
                 )
                 logger.debug("AI response received")
                 
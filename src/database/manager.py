@@ -4,19 +4,70 @@ import aiosqlite
 import logging
 import os
 import json
+from contextlib import asynccontextmanager
 from typing import List, Dict
 import litellm
 import datetime
 import asyncio
+import time
 
 logger = logging.getLogger(__name__)
 
+# Server personalities only change via the /personality command, so reads can
+# be served from a short-lived write-through cache instead of hitting SQLite
+# on every message
+SERVER_PERSONALITY_TTL_SECONDS = 60
+
 class DatabaseManager:
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # Persistent connection, opened lazily on first query; keyed by the
+        # event loop it was opened under so test suites that spin up a fresh
+        # loop per test get a fresh connection instead of a stale one
+        self._conn = None
+        self._conn_loop = None
+        # guild_id -> (personality_name, expires_at); lives here rather than
+        # in main so every writer goes through the same cache
+        self._personality_cache = {}
         # Ensure the data directory exists
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
+    async def _get_conn(self) -> aiosqlite.Connection:
+        """Return the shared connection, opening it on first use.
+
+        Opening a connection per query paid SQLite's open/close and pragma
+        cost on every call; aiosqlite serializes statements through its own
+        worker thread, so one connection is safe to share across tasks.
+        """
+        loop = asyncio.get_running_loop()
+        if self._conn is None or self._conn_loop is not loop:
+            if self._conn is not None:
+                try:
+                    await self._conn.close()
+                except Exception:
+                    pass
+            conn = await aiosqlite.connect(self.db_path)
+            # WAL mode (set persistently in init_db) lets readers proceed
+            # while a write is in flight; synchronous=NORMAL is safe under
+            # WAL and avoids an fsync per transaction
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn = conn
+            self._conn_loop = loop
+        return self._conn
+
+    @asynccontextmanager
+    async def _connect(self):
+        """Yield the shared connection instead of opening one per query."""
+        yield await self._get_conn()
+
+    async def close(self):
+        """Close the shared connection (teardown / shutdown hook)."""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._conn_loop = None
+            await conn.close()
+
     async def init_db(self):
         """Initialize the database and create tables if they don't exist."""
         logger.debug(f"Initializing database at {self.db_path}")
@@ -27,6 +78,9 @@ class DatabaseManager:
         for attempt in range(max_retries):
             try:
                 async with aiosqlite.connect(self.db_path) as db:
+                    # WAL is persistent, so setting it once here covers every
+                    # later connection to this database file
+                    await db.execute("PRAGMA journal_mode=WAL")
                     logger.debug("Creating user_memory table")
                     # Create user_memory table
                     await db.execute('''
@@ -43,11 +97,31 @@ class DatabaseManager:
                     await db.execute('''
                         CREATE TABLE IF NOT EXISTS emoji_descriptions (
                             emoji_key TEXT PRIMARY KEY, -- Format: guild_id:emoji_name
+                            guild_id TEXT,
+                            emoji_name TEXT,
                             description TEXT,
                             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                         )
                     ''')
+
+                    # Migration: older databases only had the combined
+                    # emoji_key column; add and backfill the split columns
+                    async with db.execute("PRAGMA table_info(emoji_descriptions)") as cursor:
+                        columns = {row[1] for row in await cursor.fetchall()}
+                    if "guild_id" not in columns:
+                        logger.debug("Migrating emoji_descriptions to split guild_id/emoji_name columns")
+                        await db.execute("ALTER TABLE emoji_descriptions ADD COLUMN guild_id TEXT")
+                        await db.execute("ALTER TABLE emoji_descriptions ADD COLUMN emoji_name TEXT")
+                        await db.execute('''
+                            UPDATE emoji_descriptions
+                            SET guild_id = substr(emoji_key, 1, instr(emoji_key, ':') - 1),
+                                emoji_name = substr(emoji_key, instr(emoji_key, ':') + 1)
+                        ''')
+                    await db.execute('''
+                        CREATE INDEX IF NOT EXISTS idx_emoji_descriptions_guild
+                        ON emoji_descriptions(guild_id)
+                    ''')
                     
                     logger.debug("Creating server_personalities table")
                     # Create server_personalities table for storing server personality settings
@@ -86,7 +160,7 @@ class DatabaseManager:
     async def get_user_memory(self, user_id: str):
         """Retrieve memory data for a specific user."""
         logger.debug(f"Retrieving memory for user ID: {user_id}")
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
                 "SELECT known_facts, interaction_history FROM user_memory WHERE user_id = ?", (user_id,)
             ) as cursor:
@@ -102,6 +176,27 @@ class DatabaseManager:
                     # Return default/empty memory if user not found
                     return {"known_facts": "{}", "interaction_history": "[]"}
 
+    async def get_user_memories(self, user_ids: List[str]) -> Dict[str, dict]:
+        """Retrieve memory data for several users in a single query."""
+        logger.debug(f"Retrieving memories for user IDs: {user_ids}")
+        if not user_ids:
+            return {}
+        placeholders = ",".join("?" * len(user_ids))
+        memories = {}
+        async with self._connect() as db:
+            async with db.execute(
+                f"SELECT user_id, known_facts, interaction_history FROM user_memory WHERE user_id IN ({placeholders})",
+                tuple(user_ids),
+            ) as cursor:
+                async for row in cursor:
+                    memories[row[0]] = {"known_facts": row[1], "interaction_history": row[2]}
+        # Fill in defaults for users with no stored memory
+        for user_id in user_ids:
+            if user_id not in memories:
+                memories[user_id] = {"known_facts": "{}", "interaction_history": "[]"}
+        logger.debug(f"Retrieved memories for {len(memories)} users")
+        return memories
+
     async def extract_facts_from_interaction(self, user_message: str, ai_response: str = None, context_user_id: str = None) -> Dict[str, str]:
         """Extract facts from an interaction using an LLM."""
         logger.debug(f"Extracting facts from interaction for user ID: {context_user_id}")
@@ -150,11 +245,16 @@ class DatabaseManager:
             # For now, we'll use a simple approach - in a real implementation, 
             # you might want to use a smaller, faster model for this task
             logger.debug("Calling LLM for fact extraction")
-            response = litellm.completion(
+            # Run the sync client in a worker thread so the network round
+            # trip doesn't block the event loop mid-message
+            response = await asyncio.to_thread(
+                litellm.completion,
                 model="gemini/gemini-2.5-flash-lite",  # Using the same model as the bot
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
-                max_tokens=200
+                max_tokens=200,
+                timeout=30,  # Fail fast rather than stalling a memory update
+                num_retries=2
             )
             
             # Extract the content and parse as JSON
@@ -203,8 +303,8 @@ class DatabaseManager:
         history_list.append(new_interaction)
         return history_list
 
-    async def update_user_memory(self, user_id: str, user_message: str = None, ai_response: str = None, interaction: dict = None, additional_facts: dict = None, passive_mode: bool = False):
-        """Update memory data for a specific user."""
+    async def update_user_memory(self, user_id: str, user_message: str = None, ai_response: str = None, interaction: dict = None, additional_facts: dict = None, passive_mode: bool = False) -> dict:
+        """Update memory data for a specific user and return the updated row."""
         logger.debug(f"Updating memory for user ID: {user_id}")
         logger.debug(f"Passive mode: {passive_mode}")
         logger.debug(f"User message: {user_message}")
@@ -270,7 +370,7 @@ class DatabaseManager:
         elif user_message:
             logger.debug("Creating interaction entry from message")
             # Create an interaction entry with the current timestamp
-            timestamp = str(datetime.datetime.now())
+            timestamp = str(datetime.datetime.now().timestamp())
             interaction_entry = {
                 "user_message": user_message,
                 "timestamp": timestamp
@@ -289,7 +389,7 @@ class DatabaseManager:
         updated_history = json.dumps(history_list[-20:]) # Keep last 20 interactions
         logger.debug(f"Updated history JSON: {updated_history}")
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             logger.debug("Updating database with new memory")
             await db.execute('''
                 INSERT OR REPLACE INTO user_memory (user_id, known_facts, interaction_history)
@@ -298,14 +398,18 @@ class DatabaseManager:
             await db.commit()
             logger.debug(f"Updated memory for user {user_id}")
 
+        # Return the stored row so callers can reuse it without a re-fetch
+        return {"known_facts": updated_facts_json, "interaction_history": updated_history}
+
     async def get_emoji_description(self, guild_id: int, emoji_name: str) -> str:
         """Retrieve cached description for an emoji."""
         emoji_key = f"{guild_id}:{emoji_name}"
         logger.debug(f"Retrieving emoji description for key: {emoji_key}")
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
-                "SELECT description FROM emoji_descriptions WHERE emoji_key = ?", (emoji_key,)
+                "SELECT description FROM emoji_descriptions WHERE guild_id = ? AND emoji_name = ?",
+                (str(guild_id), emoji_name)
             ) as cursor:
                 row = await cursor.fetchone()
                 if row:
@@ -321,11 +425,11 @@ class DatabaseManager:
         logger.debug(f"Saving emoji description for key: {emoji_key}")
         logger.debug(f"Description: {description}")
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute('''
-                INSERT OR REPLACE INTO emoji_descriptions (emoji_key, description, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            ''', (emoji_key, description))
+                INSERT OR REPLACE INTO emoji_descriptions (emoji_key, guild_id, emoji_name, description, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (emoji_key, str(guild_id), emoji_name, description))
             await db.commit()
             logger.debug(f"Saved description for emoji {emoji_key}")
             
@@ -334,29 +438,54 @@ class DatabaseManager:
         emoji_key = f"{guild_id}:{emoji_name}"
         logger.debug(f"Removing emoji description for key: {emoji_key}")
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute('''
-                DELETE FROM emoji_descriptions WHERE emoji_key = ?
-            ''', (emoji_key,))
+                DELETE FROM emoji_descriptions WHERE guild_id = ? AND emoji_name = ?
+            ''', (str(guild_id), emoji_name))
             await db.commit()
             logger.debug(f"Removed description for emoji {emoji_key}")
             
+    async def remove_emoji_descriptions(self, guild_id: int, emoji_names: List[str]):
+        """Remove several emoji descriptions for a guild in one statement."""
+        if not emoji_names:
+            return
+        logger.debug(f"Removing {len(emoji_names)} emoji descriptions for guild {guild_id}")
+
+        async with self._connect() as db:
+            placeholders = ", ".join("?" for _ in emoji_names)
+            await db.execute(
+                f"DELETE FROM emoji_descriptions WHERE guild_id = ? AND emoji_name IN ({placeholders})",
+                (str(guild_id), *emoji_names)
+            )
+            await db.commit()
+            logger.debug(f"Removed {len(emoji_names)} descriptions for guild {guild_id}")
+
     async def get_all_emoji_keys_for_guild(self, guild_id: int) -> List[str]:
         """Get all emoji keys for a specific guild."""
         logger.debug(f"Retrieving all emoji keys for guild ID: {guild_id}")
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
-                "SELECT emoji_key FROM emoji_descriptions WHERE emoji_key LIKE ?", (f"{guild_id}:%",)
+                "SELECT emoji_key FROM emoji_descriptions WHERE guild_id = ?", (str(guild_id),)
             ) as cursor:
                 rows = await cursor.fetchall()
                 keys = [row[0] for row in rows] if rows else []
                 logger.debug(f"Found {len(keys)} emoji keys for guild {guild_id}")
                 return keys
             
+    async def get_all_emoji_keys(self) -> List[str]:
+        """Get every cached emoji key across all guilds in one query."""
+        logger.debug("Retrieving all emoji keys")
+        async with self._connect() as db:
+            async with db.execute("SELECT emoji_key FROM emoji_descriptions") as cursor:
+                rows = await cursor.fetchall()
+                keys = [row[0] for row in rows] if rows else []
+                logger.debug(f"Found {len(keys)} emoji keys in total")
+                return keys
+
     async def clear_user_memory(self, user_id: str):
         """Clear all memory data for a specific user."""
         logger.debug(f"Clearing memory for user ID: {user_id}")
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute('''
                 DELETE FROM user_memory WHERE user_id = ?
             ''', (user_id,))
@@ -366,7 +495,7 @@ class DatabaseManager:
     async def clear_server_memory(self, guild_id: str):
         """Clear all memory data for a specific server."""
         logger.debug(f"Clearing memory for server ID: {guild_id}")
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute('''
                 DELETE FROM server_memory WHERE guild_id = ?
             ''', (guild_id,))
@@ -376,7 +505,7 @@ class DatabaseManager:
     async def get_server_memory(self, guild_id: str):
         """Retrieve memory data for a specific server."""
         logger.debug(f"Retrieving memory for server ID: {guild_id}")
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
                 "SELECT known_facts FROM server_memory WHERE guild_id = ?", (guild_id,)
             ) as cursor:
@@ -433,7 +562,7 @@ class DatabaseManager:
         updated_facts_json = json.dumps(updated_facts)
         logger.debug(f"Updated server facts JSON: {updated_facts_json}")
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             logger.debug("Updating database with new server memory")
             await db.execute('''
                 INSERT OR REPLACE INTO server_memory (guild_id, known_facts)
@@ -486,11 +615,16 @@ class DatabaseManager:
         try:
             # Use the same model as configured for the bot
             logger.debug("Calling LLM for server fact extraction")
-            response = litellm.completion(
+            # Same as extract_facts_from_interaction: keep the sync client
+            # off the event loop
+            response = await asyncio.to_thread(
+                litellm.completion,
                 model="gemini/gemini-2.5-flash-lite",  # Using the same model as the bot
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
-                max_tokens=200
+                max_tokens=200,
+                timeout=30,  # Fail fast rather than stalling a memory update
+                num_retries=2
             )
             
             # Extract the content and parse as JSON
@@ -514,26 +648,33 @@ class DatabaseManager:
 
     async def get_server_personality(self, guild_id: str) -> str:
         """Retrieve the personality setting for a server."""
+        cached = self._personality_cache.get(guild_id)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
         logger.debug(f"Retrieving personality for guild ID: {guild_id}")
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             async with db.execute(
                 "SELECT personality_name FROM server_personalities WHERE guild_id = ?", (guild_id,)
             ) as cursor:
                 row = await cursor.fetchone()
                 if row:
                     logger.debug(f"Found personality for guild {guild_id}: {row[0]}")
-                    return row[0]
+                    personality = row[0]
                 else:
                     logger.debug(f"No personality found for guild {guild_id}, returning default")
-                    return "default"  # Default personality
+                    personality = "default"  # Default personality
+                self._personality_cache[guild_id] = (personality, time.monotonic() + SERVER_PERSONALITY_TTL_SECONDS)
+                return personality
 
     async def set_server_personality(self, guild_id: str, personality_name: str):
         """Save the personality setting for a server."""
         logger.debug(f"Setting personality '{personality_name}' for guild ID: {guild_id}")
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connect() as db:
             await db.execute('''
                 INSERT OR REPLACE INTO server_personalities (guild_id, personality_name, updated_at)
                 VALUES (?, ?, CURRENT_TIMESTAMP)
             ''', (guild_id, personality_name))
             await db.commit()
+            # Write through so the next read reflects the change immediately
+            self._personality_cache[guild_id] = (personality_name, time.monotonic() + SERVER_PERSONALITY_TTL_SECONDS)
             logger.debug(f"Set personality '{personality_name}' for guild {guild_id}")
\ No newline at end of file
@@ -2,12 +2,27 @@ import discord
 from discord.ext import commands
 import os
 import logging
-import tomllib  # For reading TOML config
 from dotenv import load_dotenv  # For loading .env variables
 import litellm  # For AI interactions
 import asyncio  # For background tasks
 import json  # For JSON handling
 import inspect  # For safe async iteration checks in tests
+
+# Prefer orjson (C extension, several times faster for loads/dumps) for the
+# per-mention prompt assembly; fall back to the stdlib when unavailable.
+try:
+    import orjson as _orjson
+
+    _json_loads = _orjson.loads
+
+    def _json_dumps(obj):
+        return _orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+import time  # For prompt cache expiry
+from contextlib import asynccontextmanager  # For the typing-indicator helper
+from functools import lru_cache  # For caching personality prompts
 # Import database manager
 from src.database.manager import DatabaseManager
 # Import personality system
@@ -26,9 +41,16 @@ from src.utils.emoji_formatter import format_emojis_for_discord
 TEST_ENV = os.getenv("TEST_ENV") not in (None, "", "0", "false", "False")
 
 # Load configuration from config.toml
+# Cached by (path, mtime) so reimports (tests, reloads) don't re-parse the
+# file; tomllib is imported lazily so module import doesn't pay its cost.
+@lru_cache(maxsize=1)
+def _load_config(path, mtime):
+    import tomllib  # For reading TOML config
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
 try:
-    with open("config.toml", "rb") as f:
-        config = tomllib.load(f)
+    config = _load_config("config.toml", os.path.getmtime("config.toml"))
 except FileNotFoundError:
     if TEST_ENV:
         # In tests, avoid hard exit on import; use a minimal default config
@@ -192,18 +214,14 @@ bot.db_manager = db_manager
 # Attach config to bot for use by cogs
 bot.config = config
 
-# Force sync commands
 @bot.event
 async def on_connect():
     logger.info("Bot connected to Discord gateway")
     logger.debug(f"Bot user: {bot.user}")
-    logger.debug(f"Auto sync commands: {bot.auto_sync_commands}")
-    if bot.auto_sync_commands:
-        logger.info("Syncing commands...")
-        await bot.sync_commands()
-        logger.info("Commands synced successfully")
-        
-# Also sync commands when the bot is ready
+    # Note: commands are synced once in on_ready, after the cogs are
+    # registered. Syncing here too would issue a redundant REST call.
+
+# Sync commands when the bot is ready
 @bot.event
 async def on_ready():
     logger.info(f'Bot {bot.user} has connected to Discord!')
@@ -272,13 +290,98 @@ except Exception as e:
 # Import personality functions after bot setup
 from src.utils.personalities import get_server_personality as get_memory_server_personality, set_server_personality as set_memory_server_personality
 
-# Wrapper functions for database-backed personality storage
+# --- Prompt caches ---
+# The personality prompt and the enhanced emoji prompt are rebuilt on every
+# mention even though they only change when the guild's personality or emoji
+# set changes. Cache both so the hot path is a lookup instead of string
+# assembly plus DB hits.
+EMOJI_PROMPT_TTL_SECONDS = 300
+
+# guild_id -> (prompt, expires_at)
+_emoji_prompt_cache = {}
+
+# --- Passive listening debounce ---
+# In passive mode (messages we don't respond to) every visible message used to
+# trigger a DB write plus a fact-extraction LLM call. In a busy guild that is
+# the dominant write volume, so rate-limit passive memory updates to one write
+# per user per window.
+PASSIVE_MEMORY_DEBOUNCE_SECONDS = 30
+
+# (guild_id, user_id) -> monotonic time of last passive write
+_passive_last_write = {}
+
+@lru_cache(maxsize=32)
+def _personality_prompt_cached(personality_name):
+    """Cached wrapper around get_personality_prompt keyed by personality name."""
+    return get_personality_prompt(personality_name)
+
+async def _get_emoji_prompt_cached(guild):
+    """Get the enhanced emoji prompt for a guild, using a TTL cache."""
+    cache_key = guild.id if guild else None
+    cached = _emoji_prompt_cache.get(cache_key)
+    if cached is not None and cached[1] > time.monotonic():
+        logger.debug(f"Using cached emoji prompt for guild {cache_key}")
+        return cached[0]
+    emoji_prompt = await create_enhanced_emoji_prompt(guild, db_manager)
+    _emoji_prompt_cache[cache_key] = (emoji_prompt, time.monotonic() + EMOJI_PROMPT_TTL_SECONDS)
+    return emoji_prompt
+
+@bot.event
+async def on_guild_emojis_update(guild, before, after):
+    """Refresh the emoji cache for a guild when its emoji set changes."""
+    logger.debug(f"Guild emojis updated for guild {guild.id}, invalidating emoji prompt cache")
+    _emoji_prompt_cache.pop(guild.id, None)
+    # Re-describe this guild's emojis right away; the periodic background
+    # scan is only a safety net for missed gateway events
+    try:
+        await emoji_manager.check_emojis_for_guild(guild)
+    except Exception as e:
+        logger.error(f"Error refreshing emoji cache for guild {guild.id}: {e}")
+
+@asynccontextmanager
+async def _typing_indicator(channel):
+    """Hold the typing indicator open for the duration of the block.
+
+    Uses channel.typing() when it provides an async context manager and
+    falls back to a one-shot trigger_typing() otherwise (e.g. test mocks).
+    """
+    typing_cm = None
+    try:
+        candidate = channel.typing()
+        if hasattr(candidate, "__aenter__"):
+            typing_cm = candidate
+        elif inspect.iscoroutine(candidate):
+            candidate.close()
+    except (AttributeError, TypeError):
+        typing_cm = None
+    if typing_cm is None:
+        try:
+            await channel.trigger_typing()
+        except Exception as e:
+            logger.debug(f"Could not trigger typing indicator: {e}")
+        yield
+        return
+    async with typing_cm:
+        yield
+
+def _message_timestamp(message) -> str:
+    """Return the message's creation time as a compact epoch string."""
+    created_at = message.created_at
+    try:
+        return str(created_at.timestamp())
+    except AttributeError:
+        # Fall back for objects without a datetime created_at (e.g. test mocks)
+        return str(created_at)
+
+# Wrapper functions for database-backed personality storage. The manager
+# itself caches personalities with a write-through TTL cache, so every
+# writer (including the /personality cog) shares the same cached view.
+
 async def get_server_personality(guild_id):
     """Get the current personality for a server, with database persistence."""
     # Try to get from database first
     try:
-        personality = await db_manager.get_server_personality(str(guild_id))
-        return personality
+        return await db_manager.get_server_personality(str(guild_id))
     except Exception as e:
         logger.error(f"Error retrieving personality from database: {e}")
         # Fallback to in-memory storage
@@ -328,9 +431,9 @@ async def on_message(message):
         logger.debug("Recording user's message in memory")
         interaction = {
             "user_message": message.content,
-            "timestamp": str(message.created_at)
+            "timestamp": _message_timestamp(message)
         }
-        await db_manager.update_user_memory(user_id, user_message=message.content, interaction=interaction)
+        updated_memory = await db_manager.update_user_memory(user_id, user_message=message.content, interaction=interaction)
         logger.debug("User message recorded successfully")
         
         # Check if this is a memory update request (mentioning another user)
@@ -350,9 +453,13 @@ async def on_message(message):
                         logger.debug(f"Target user for memory update: {target_user.name} (ID: {target_user_id})")
                         break
         
-        # Retrieve user context/memory
+        # Reuse the row returned by the update above instead of re-querying;
+        # fall back to a fetch if the update didn't return one
         logger.debug("Retrieving user memory")
-        user_memory = await db_manager.get_user_memory(user_id)
+        if isinstance(updated_memory, dict):
+            user_memory = updated_memory
+        else:
+            user_memory = await db_manager.get_user_memory(user_id)
         logger.debug(f"User memory retrieved: {user_memory}")
         
         # Retrieve server memory if in a guild
@@ -387,18 +494,16 @@ async def on_message(message):
                             recent_authors.add(str(msg.author.id))
                 
                 logger.debug(f"Recent authors identified: {recent_authors}")
-                
+
                 # Get memories for recent authors (limit to 3 to avoid overwhelming)
-                author_count = 0
-                for author_id in recent_authors:
-                    if author_count >= 3:
-                        break
-                    logger.debug(f"Retrieving memory for author ID: {author_id}")
-                    author_memory = await db_manager.get_user_memory(author_id)
-                    if author_memory and author_memory.get("known_facts"):
-                        other_user_memories[author_id] = author_memory
-                        logger.debug(f"Memory retrieved for author {author_id}")
-                    author_count += 1
+                # Fetch them all in a single query instead of one round-trip per author
+                author_ids = list(recent_authors)[:3]
+                if author_ids:
+                    author_memories = await db_manager.get_user_memories(author_ids)
+                    for author_id, author_memory in author_memories.items():
+                        if author_memory and author_memory.get("known_facts"):
+                            other_user_memories[author_id] = author_memory
+                            logger.debug(f"Memory retrieved for author {author_id}")
             except Exception as e:
                 logger.warning(f"Could not fetch other user memories: {e}")
         
@@ -407,13 +512,12 @@ async def on_message(message):
         logger.debug(f"Getting personality for guild ID: {guild_id}")
         personality_name = await get_server_personality(guild_id)
         logger.info(f"Using personality '{personality_name}' for guild {guild_id}")
-        personality_prompt = get_personality_prompt(personality_name)
+        personality_prompt = _personality_prompt_cached(personality_name)
         logger.debug(f"Personality prompt: {personality_prompt[:200]}...")
         
-        # Check if emoji caching is in progress
-        global emoji_manager
+        # Check if emoji caching is in progress (single event-flag read)
         logger.debug("Checking if emoji caching is in progress")
-        if emoji_manager.is_caching_in_progress():
+        if not emoji_manager.ready.is_set():
             logger.debug("Emoji caching in progress, using simple emoji prompt")
             # If caching is in progress, send a waiting message
             await message.channel.send("Emojis are currently being cached and processed. Please wait...")
@@ -424,7 +528,7 @@ async def on_message(message):
             logger.debug("Getting enhanced emoji prompt with visual descriptions")
             # Get enhanced emoji prompt with visual descriptions
             # Note: This now uses cached data, so it won't block
-            emoji_prompt = await create_enhanced_emoji_prompt(message.guild, db_manager)
+            emoji_prompt = await _get_emoji_prompt_cached(message.guild)
             logger.debug("Enhanced emoji prompt retrieved")
         
         # Prepare prompt with personality, memory, and emoji information
@@ -432,7 +536,7 @@ async def on_message(message):
         logger.debug("Preparing user memory for prompt")
         memory_facts = user_memory.get("known_facts", "{}")
         try:
-            facts_dict = json.loads(memory_facts)
+            facts_dict = _json_loads(memory_facts)
             logger.debug(f"User facts dictionary: {facts_dict}")
             # Only include a subset of facts to avoid overwhelming the conversation
             # And be more selective about which facts to include
@@ -450,7 +554,7 @@ async def on_message(message):
                 if key not in priority_keys and value and fact_count < 5:
                     limited_facts[key] = value
                     fact_count += 1
-            user_limited_memory = json.dumps(limited_facts) if limited_facts else "{}"
+            user_limited_memory = _json_dumps(limited_facts) if limited_facts else "{}"
             logger.debug(f"Limited user memory: {user_limited_memory}")
         except Exception as e:
             logger.warning(f"Error processing user memory facts: {e}")
@@ -460,7 +564,7 @@ async def on_message(message):
         logger.debug("Preparing server memory for prompt")
         server_facts = server_memory.get("known_facts", "{}")
         try:
-            server_facts_dict = json.loads(server_facts)
+            server_facts_dict = _json_loads(server_facts)
             logger.debug(f"Server facts dictionary: {server_facts_dict}")
             # Limit server facts to avoid overwhelming
             limited_server_facts = {}
@@ -469,7 +573,7 @@ async def on_message(message):
                 if value and server_fact_count < 3:
                     limited_server_facts[key] = value
                     server_fact_count += 1
-            server_limited_memory = json.dumps(limited_server_facts) if limited_server_facts else "{}"
+            server_limited_memory = _json_dumps(limited_server_facts) if limited_server_facts else "{}"
             logger.debug(f"Limited server memory: {server_limited_memory}")
         except Exception as e:
             logger.warning(f"Error processing server memory facts: {e}")
@@ -483,7 +587,7 @@ async def on_message(message):
             other_memories_parts = []
             for user_id, memory in other_user_memories.items():
                 try:
-                    facts_dict = json.loads(memory.get("known_facts", "{}"))
+                    facts_dict = _json_loads(memory.get("known_facts", "{}"))
                     logger.debug(f"Processing memory for user {user_id}: {facts_dict}")
                     if facts_dict:
                         # Only include the most important fact per user
@@ -505,11 +609,31 @@ async def on_message(message):
                 other_memories_text = "\nOther active users: " + ", ".join(other_memories_parts[:3])  # Limit to 3 users
                 logger.debug(f"Other user memories text: {other_memories_text}")
         
-        full_prompt = f"{personality_prompt}\n\nUser Memory: {user_limited_memory}\nServer Memory: {server_limited_memory}{other_memories_text}\nUser Message: {message.content}{emoji_prompt}\nRespond as the AI with the personality described above:"
+        # Assemble the prompt in a single join instead of one large f-string
+        # so each piece is concatenated exactly once
+        full_prompt = "".join([
+            personality_prompt,
+            "\n\nUser Memory: ", user_limited_memory,
+            "\nServer Memory: ", server_limited_memory,
+            other_memories_text,
+            "\nUser Message: ", message.content,
+            emoji_prompt,
+            "\nRespond as the AI with the personality described above:",
+        ])
         
         # Call LLM
         try:
-            response = litellm.completion(model=config['ai']['default_model'], messages=[{"role": "user", "content": full_prompt}])
+            # Keep the typing indicator up for the whole generation and run
+            # the blocking completion call off the event loop
+            async with _typing_indicator(message.channel):
+                response = await asyncio.to_thread(
+                    litellm.completion,
+                    model=config['ai']['default_model'],
+                    messages=[{"role": "user", "content": full_prompt}],
+                    max_tokens=3000,
+                    timeout=60,  # Bound how long a reply can hang the typing indicator
+                    num_retries=2,
+                )
             ai_reply = response['choices'][0]['message']['content']
             
             # Format emojis to ensure they're in the proper Discord-friendly format
@@ -530,7 +654,7 @@ async def on_message(message):
             interaction = {
                 "user_message": message.content,
                 "ai_response": processed_reply,
-                "timestamp": str(message.created_at)
+                "timestamp": _message_timestamp(message)
             }
             await db_manager.update_user_memory(user_id, user_message=message.content, ai_response=processed_reply, interaction=interaction)
             
@@ -548,14 +672,22 @@ async def on_message(message):
         # Always update user memory with the new message, even if we don't respond
         # This allows the bot to learn from all conversations it can see
         # But be more conservative about fact extraction in passive listening mode
-        interaction = {
-            "user_message": message.content,
-            "timestamp": str(message.created_at)
-        }
-        
-        # For passive listening, only extract facts if there's high confidence
-        # and the message contains clear factual information about users
-        await db_manager.update_user_memory(user_id, user_message=message.content, interaction=interaction, passive_mode=True)
+        # Debounce per user so a chatty user doesn't trigger a DB write per message
+        now = time.monotonic()
+        debounce_key = (message.guild.id if message.guild else None, user_id)
+        last_write = _passive_last_write.get(debounce_key)
+        if last_write is not None and now - last_write < PASSIVE_MEMORY_DEBOUNCE_SECONDS:
+            logger.debug(f"Skipping passive memory update for user {user_id} (debounced)")
+        else:
+            _passive_last_write[debounce_key] = now
+            interaction = {
+                "user_message": message.content,
+                "timestamp": _message_timestamp(message)
+            }
+
+            # For passive listening, only extract facts if there's high confidence
+            # and the message contains clear factual information about users
+            await db_manager.update_user_memory(user_id, user_message=message.content, interaction=interaction, passive_mode=True)
     
     # Important: Process events for cogs after handling the message
     # This allows other cogs like reactions to process the message as well
@@ -570,20 +702,39 @@ async def on_message(message):
             # If bot.cogs.items() is not iterable (e.g., in test environment with Mock objects)
             logger.debug("bot.cogs.items() is not iterable, skipping cog event handlers")
         else:
+            # Dispatch to all cogs concurrently instead of one after another,
+            # so a slow handler (e.g. reactions making an LLM call) doesn't
+            # delay the others
+            handler_names = []
+            handlers = []
             for cog_name, cog in bot.cogs.items():
                 if hasattr(cog, 'on_message'):
-                    try:
-                        logger.debug(f"Calling on_message for cog: {cog_name}")
-                        await cog.on_message(message)
+                    logger.debug(f"Scheduling on_message for cog: {cog_name}")
+                    handler_names.append(cog_name)
+                    handlers.append(cog.on_message(message))
+            if handlers:
+                results = await asyncio.gather(*handlers, return_exceptions=True)
+                for cog_name, result in zip(handler_names, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Error calling on_message for cog {cog_name}: {result}", exc_info=result)
+                    else:
                         logger.debug(f"Finished calling on_message for cog: {cog_name}")
-                    except Exception as e:
-                        logger.error(f"Error calling on_message for cog {cog_name}: {e}", exc_info=True)
     else:
         logger.debug("Skipping cog event handlers - bot.cogs not properly initialized")
     logger.debug("Finished calling all cog event handlers")
 
 # --- Run the Bot ---
 if __name__ == "__main__":
+    # Use uvloop's C event loop when it's installed (optional, non-Windows);
+    # the bot is almost entirely await-bound, so cheaper task scheduling
+    # helps every message
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop policy")
     try:
         bot.run(DISCORD_TOKEN)
     except KeyboardInterrupt:
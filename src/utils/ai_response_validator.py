@@ -3,12 +3,170 @@
 import logging
 import litellm
 import json
+import time
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
-from src.utils.emoji_parser import find_invalid_emoji_tags
+from src.utils.emoji_parser import extract_emoji_tags, find_invalid_emoji_tags, is_unicode_emoji
 from src.utils.emoji_formatter import validate_emoji_formatting
 
 logger = logging.getLogger(__name__)
 
+# Guild emoji sets change rarely, so a short TTL keeps the sorted-name
+# tuple from being rebuilt on every validation (including each retry)
+EMOJI_NAMES_TTL_SECONDS = 60
+_guild_emoji_names_cache = {}  # guild_id -> (names_tuple, expires_at)
+
+def _guild_emoji_names(guild) -> Optional[Tuple[str, ...]]:
+    """Return a sorted tuple of the guild's emoji names, or None if unavailable."""
+    guild_id = getattr(guild, "id", None)
+    if guild_id is not None:
+        cached = _guild_emoji_names_cache.get(guild_id)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+    try:
+        names = tuple(sorted(e.name for e in guild.emojis))
+    except (TypeError, AttributeError):
+        # Guild may be None or a mock without iterable emojis
+        return None
+    if guild_id is not None:
+        _guild_emoji_names_cache[guild_id] = (names, time.monotonic() + EMOJI_NAMES_TTL_SECONDS)
+    return names
+
+@lru_cache(maxsize=2048)
+def _invalid_emoji_tags_cached(text: str, emoji_names: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Cached invalid-tag scan keyed by (text, guild emoji names).
+
+    Responses frequently repeat the same emoji phrasing, and the retry loop
+    re-validates the same text, so memoizing avoids re-tokenizing.
+    """
+    names = set(emoji_names)
+    invalid = []
+    for tag in extract_emoji_tags(text):
+        # Unicode emojis are always considered valid (mirrors validate_emoji_tag)
+        if is_unicode_emoji(tag):
+            continue
+        if tag not in names:
+            invalid.append(tag)
+    return tuple(invalid)
+
+# Cap how many emoji names we list in a retry prompt
+_MAX_EMOJI_NAMES_IN_PROMPT = 50
+
+def _strip_invalid_emoji_tags(text: str, invalid_emojis: List[str]) -> str:
+    """Deterministically remove invalid {tags} instead of asking the model again."""
+    for tag in invalid_emojis:
+        literal = f"{{{tag}}}"
+        # Absorb one adjacent space so removal doesn't leave a doubled space,
+        # without touching whitespace anywhere else in the response
+        text = text.replace(f" {literal}", "").replace(f"{literal} ", "").replace(literal, "")
+    return text.strip()
+
+def _find_invalid_emoji_tags(text: str, guild) -> List[str]:
+    """Find invalid emoji tags, using the memoized scan when possible."""
+    emoji_names = _guild_emoji_names(guild)
+    if emoji_names is None:
+        return find_invalid_emoji_tags(text, guild)
+    return list(_invalid_emoji_tags_cached(text, emoji_names))
+
+def _build_retry_prompt(original_prompt, current_response, invalid_emojis, improper_formatting, guild) -> str:
+    """Build the corrective prompt for a response with emoji issues."""
+    issues = []
+    if invalid_emojis:
+        issues.append(f"invalid emoji references: {', '.join(invalid_emojis)}")
+    if improper_formatting:
+        issues.append("improper emoji formatting")
+
+    # Tell the model which names are actually valid so it doesn't have
+    # to guess its way out of the invalid ones
+    emoji_names = _guild_emoji_names(guild)
+    valid_names_hint = ""
+    if emoji_names:
+        listed = ", ".join(f"{{{name}}}" for name in emoji_names[:_MAX_EMOJI_NAMES_IN_PROMPT])
+        valid_names_hint = f"\nThe only valid custom emoji names for this server are: {listed}"
+
+    return f"""
+{original_prompt}
+
+Your previous response contained {', '.join(issues)}.
+Please rewrite your response using only valid emojis from the server or standard Unicode emojis.{valid_names_hint}
+Remember to enclose custom emoji names in curly braces like {{emoji_name}} for custom emojis or use Unicode emojis directly.
+Do NOT use the Discord emoji format like <:emoji_name:123456789>.
+
+Previous response: {current_response}
+""".strip()
+
+def _extract_response_content(response) -> str:
+    """Pull the message content out of a litellm completion response."""
+    if (response and
+        'choices' in response and
+        len(response['choices']) > 0 and
+        response['choices'][0] and
+        'message' in response['choices'][0] and
+        response['choices'][0]['message'] and
+        'content' in response['choices'][0]['message']):
+        return response['choices'][0]['message']['content']
+    return ""
+
+async def validate_and_retry_ai_responses(
+    response_texts: List[str],
+    guild,
+    config: Dict,
+    original_prompts: List[str]
+) -> List[Tuple[str, bool]]:
+    """
+    Validate several AI responses at once, fixing all of the invalid ones
+    with a single litellm.batch_completion call instead of one completion
+    per bad response. Responses still broken after the batched round have
+    their invalid tags stripped deterministically.
+
+    Returns one (final_response_text, was_retry_performed) pair per input.
+    """
+    results = [(text, False) for text in response_texts]
+    pending = []  # (index, invalid_emojis, improper_formatting)
+
+    for index, text in enumerate(response_texts):
+        invalid_emojis = _find_invalid_emoji_tags(text, guild)
+        improper_formatting = not validate_emoji_formatting(text)
+        if invalid_emojis or improper_formatting:
+            pending.append((index, invalid_emojis, improper_formatting))
+
+    if not pending:
+        return results
+
+    logger.debug(f"Batch-retrying {len(pending)} of {len(response_texts)} responses")
+    batched_messages = [
+        [{"role": "user", "content": _build_retry_prompt(
+            original_prompts[index], response_texts[index],
+            invalid_emojis, improper_formatting, guild)}]
+        for index, invalid_emojis, improper_formatting in pending
+    ]
+
+    retry_responses = None
+    try:
+        retry_responses = litellm.batch_completion(
+            model=config['ai']['default_model'],
+            messages=batched_messages,
+            temperature=0.7,
+            max_tokens=3000,
+            timeout=60,
+            num_retries=2
+        )
+    except Exception as e:
+        logger.error(f"Error during batched retry: {e}")
+
+    for position, (index, invalid_emojis, improper_formatting) in enumerate(pending):
+        current_response = response_texts[index]
+        if retry_responses is not None and position < len(retry_responses):
+            new_response = _extract_response_content(retry_responses[position])
+            if new_response:
+                current_response = new_response
+                invalid_emojis = _find_invalid_emoji_tags(current_response, guild)
+        if invalid_emojis:
+            current_response = _strip_invalid_emoji_tags(current_response, invalid_emojis)
+        results[index] = (current_response, True)
+
+    return results
+
 async def validate_and_retry_ai_response(
     response_text: str,
     guild,
@@ -32,7 +190,7 @@ async def validate_and_retry_ai_response(
     logger.debug(f"Validating AI response: {response_text[:100]}...")
     
     # Check for invalid emoji tags
-    invalid_emojis = find_invalid_emoji_tags(response_text, guild)
+    invalid_emojis = _find_invalid_emoji_tags(response_text, guild)
     
     # Check for improper emoji formatting
     improper_formatting = not validate_emoji_formatting(response_text)
@@ -51,23 +209,9 @@ async def validate_and_retry_ai_response(
         retry_count += 1
         logger.debug(f"Retry attempt {retry_count}/{max_retries}")
         
-        # Create a retry prompt that specifically addresses the issues
-        issues = []
-        if invalid_emojis:
-            issues.append(f"invalid emoji references: {', '.join(invalid_emojis)}")
-        if improper_formatting:
-            issues.append("improper emoji formatting")
-            
-        retry_prompt = f"""
-{original_prompt}
-
-Your previous response contained {', '.join(issues)}.
-Please rewrite your response using only valid emojis from the server or standard Unicode emojis.
-Remember to enclose custom emoji names in curly braces like {{emoji_name}} for custom emojis or use Unicode emojis directly.
-Do NOT use the Discord emoji format like <:emoji_name:123456789>.
-
-Previous response: {current_response}
-""".strip()
+        retry_prompt = _build_retry_prompt(
+            original_prompt, current_response, invalid_emojis, improper_formatting, guild
+        )
         
         logger.debug(f"Retry prompt: {retry_prompt[:200]}...")
         
@@ -77,27 +221,26 @@ Previous response: {current_response}
                 model=config['ai']['default_model'],
                 messages=[{"role": "user", "content": retry_prompt}],
                 temperature=0.7,
-                max_tokens=3000
+                max_tokens=3000,
+                timeout=60,
+                num_retries=2
             )
             
             # Extract the new response
-            new_response = ""
-            if (retry_response and 
-                'choices' in retry_response and 
-                len(retry_response['choices']) > 0 and 
-                retry_response['choices'][0] and 
-                'message' in retry_response['choices'][0] and 
-                retry_response['choices'][0]['message'] and 
-                'content' in retry_response['choices'][0]['message']):
-                new_response = retry_response['choices'][0]['message']['content']
-            
+            new_response = _extract_response_content(retry_response)
             logger.debug(f"Retry response: {new_response[:100]}...")
-            
+
+            # If the model returned the same response again, further retries
+            # with the same prompt will not fix anything - stop burning calls.
+            if new_response.strip() == current_response.strip():
+                logger.debug("Retry returned an identical response, stopping retries")
+                break
+
             # Update current response
             current_response = new_response
-            
+
             # Check for issues again
-            invalid_emojis = find_invalid_emoji_tags(current_response, guild)
+            invalid_emojis = _find_invalid_emoji_tags(current_response, guild)
             improper_formatting = not validate_emoji_formatting(current_response)
             logger.debug(f"Issues after retry - invalid emojis: {invalid_emojis}, improper formatting: {improper_formatting}")
             
@@ -108,5 +251,11 @@ Previous response: {current_response}
     
     if invalid_emojis or improper_formatting:
         logger.warning(f"Still have issues after {retry_count} retries - invalid emojis: {invalid_emojis}, improper formatting: {improper_formatting}")
-    
+
+    # Whatever couldn't be fixed by retrying gets stripped deterministically
+    # rather than shipping broken tags to Discord
+    if invalid_emojis:
+        current_response = _strip_invalid_emoji_tags(current_response, invalid_emojis)
+        logger.debug(f"Stripped invalid emoji tags, final response: {current_response[:100]}...")
+
     return current_response, True
\ No newline at end of file
@@ -1,26 +1,100 @@
 # src/utils/emoji_analyzer.py
 
-import base64
+import asyncio
 import io
 import logging
+import os
+import re
+import time
+from functools import lru_cache
 from typing import Dict, List, Optional
+import aiohttp
 import litellm
 import discord
 import requests
 from io import BytesIO
 import tomllib
+from urllib.parse import urlparse
+
+# pybase64 provides SIMD-accelerated encoding; base64 encoding runs once per
+# emoji per guild refresh, so take it when it's installed and fall back to
+# the stdlib otherwise
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# pybase64's b64encode_as_string returns str directly, skipping the decode
+# copy of the encoded payload; emulate it on the stdlib
+_b64encode_as_string = getattr(
+    base64, "b64encode_as_string",
+    lambda data: base64.b64encode(data).decode('ascii'),
+)
 
 # Import database manager
 from src.database.manager import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# Shared session so repeated downloads reuse connections to the Discord CDN
+# instead of paying a TCP/TLS handshake per emoji
+_http_session = requests.Session()
+
+# Cap concurrent vision requests so gathering many emojis doesn't hammer the
+# provider; the semaphore is created per event loop since asyncio primitives
+# can't be shared across loops (tests create a fresh loop per case)
+MAX_CONCURRENT_VISION_CALLS = 4
+_vision_semaphores = {}  # event loop -> semaphore
+
+def _get_vision_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _vision_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_VISION_CALLS)
+        _vision_semaphores[loop] = semaphore
+    return semaphore
+
+# Fallback wait when a rate limit response carries no Retry-After header
+RATE_LIMIT_FALLBACK_DELAY = 5.0
+
+def _rate_limit_delay(error) -> float:
+    """Read the server-advised Retry-After from a rate limit error, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers:
+        try:
+            return float(headers.get("Retry-After", RATE_LIMIT_FALLBACK_DELAY))
+        except (TypeError, ValueError):
+            pass
+    return RATE_LIMIT_FALLBACK_DELAY
+
+async def _vision_completion(**kwargs):
+    """
+    Call litellm.acompletion, waiting out one rate limit if the provider
+    asks us to instead of blindly retrying on a fixed delay.
+    """
+    try:
+        return await litellm.acompletion(**kwargs)
+    except litellm.RateLimitError as e:
+        delay = _rate_limit_delay(e)
+        logger.warning(f"Vision model rate limited, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+        return await litellm.acompletion(**kwargs)
+
+@lru_cache(maxsize=1)
+def _read_config(mtime: float):
+    """Parse config.toml; cached on the file's mtime so edits still apply."""
+    with open("config.toml", "rb") as f:
+        return tomllib.load(f)
+
+def clear_config_cache():
+    """Drop the parsed config (for tests and config reloads)."""
+    _read_config.cache_clear()
+
 def get_config():
     """Get the configuration from config.toml"""
     logger.debug("Loading configuration from config.toml")
     try:
-        with open("config.toml", "rb") as f:
-            config = tomllib.load(f)
+        config = _read_config(os.path.getmtime("config.toml"))
         logger.debug("Configuration loaded successfully")
         return config
     except Exception as e:
@@ -50,7 +124,7 @@ def download_emoji_image(url: str) -> Optional[bytes]:
     """
     logger.debug(f"Downloading emoji image from URL: {url}")
     try:
-        response = requests.get(url, timeout=10)
+        response = _http_session.get(url, timeout=10)
         response.raise_for_status()
         logger.debug(f"Successfully downloaded emoji image, size: {len(response.content)} bytes")
         return response.content
@@ -58,18 +132,76 @@ def download_emoji_image(url: str) -> Optional[bytes]:
         logger.warning(f"Could not download emoji image from {url}: {e}")
         return None
 
+# Shared aiohttp session per event loop (the loop rarely changes outside of
+# tests): keeping connections alive amortizes the CDN TLS handshake across a
+# guild's worth of emoji downloads instead of paying it per request
+_aiohttp_sessions = {}  # event loop -> ClientSession
+
+def _get_aiohttp_session() -> aiohttp.ClientSession:
+    loop = asyncio.get_running_loop()
+    session = _aiohttp_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+        _aiohttp_sessions[loop] = session
+    return session
+
+async def download_emoji_image_async(url: str) -> Optional[bytes]:
+    """
+    Download an emoji image without blocking the event loop.
+    """
+    logger.debug(f"Downloading emoji image from URL: {url}")
+    try:
+        session = _get_aiohttp_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+            content = await response.read()
+        logger.debug(f"Successfully downloaded emoji image, size: {len(content)} bytes")
+        return content
+    except Exception as e:
+        logger.warning(f"Could not download emoji image from {url}: {e}")
+        return None
+
+# Hosts the vision providers can fetch themselves; emoji URLs on these skip
+# the download-and-base64 step entirely and go into the request as-is
+_PASSTHROUGH_HOSTS = frozenset({"cdn.discordapp.com", "media.discordapp.net"})
+
+def _is_passthrough_image_url(url: str) -> bool:
+    """Check whether a URL can be handed straight to the vision model."""
+    try:
+        return urlparse(url).netloc in _PASSTHROUGH_HOSTS
+    except (TypeError, ValueError):
+        return False
+
 def encode_image_to_base64(image_bytes: bytes) -> str:
     """
     Encode image bytes to base64 string for use in API requests.
     """
     logger.debug(f"Encoding image to base64, size: {len(image_bytes)} bytes")
-    encoded = base64.b64encode(image_bytes).decode('utf-8')
+    encoded = _b64encode_as_string(image_bytes)
     logger.debug(f"Encoded image to base64, length: {len(encoded)} characters")
     return encoded
 
+def encode_image_as_data_uri(image_bytes: bytes, animated: bool = False) -> str:
+    """
+    Encode image bytes straight into a data URI for vision requests.
+
+    Builds the final string in one concatenation instead of encoding to an
+    intermediate and formatting it again, and picks the gif mime type for
+    animated emojis.
+    """
+    mime = "image/gif" if animated else "image/png"
+    logger.debug(f"Encoding image as {mime} data URI, size: {len(image_bytes)} bytes")
+    return f"data:{mime};base64," + _b64encode_as_string(image_bytes)
+
+@lru_cache(maxsize=64)
 def is_vision_capable_model(model: str) -> bool:
     """
     Check if a model is vision capable based on its name.
+
+    Memoized; the answer for a given model name never changes and this is
+    called for every uncached emoji.
     """
     logger.debug(f"Checking if model is vision capable: {model}")
     if not model:
@@ -90,18 +222,51 @@ def is_vision_capable_model(model: str) -> bool:
     logger.debug(f"Model vision capability: {is_vision}")
     return is_vision
 
+# In-process cache in front of the database lookups; bounded and TTL'd so
+# memory stays flat regardless of guild count and re-uploaded emojis age
+# out. Keyed by emoji id, not name, so a re-upload under the same name
+# misses. Cleared wholesale when full (repo-wide cache idiom).
+EMOJI_DESCRIPTION_TTL_SECONDS = 24 * 60 * 60
+_DESCRIPTION_CACHE_MAXSIZE = 10000
+_description_cache = {}  # (guild_id, emoji_id) -> (description, expires_at)
+
+def _cached_description(guild_id: int, emoji_id: int) -> Optional[str]:
+    entry = _description_cache.get((guild_id, emoji_id))
+    if entry is not None and entry[1] > time.monotonic():
+        return entry[0]
+    return None
+
+def _remember_description(guild_id: int, emoji_id: int, description: str):
+    if len(_description_cache) >= _DESCRIPTION_CACHE_MAXSIZE:
+        _description_cache.clear()
+    _description_cache[(guild_id, emoji_id)] = (
+        description, time.monotonic() + EMOJI_DESCRIPTION_TTL_SECONDS
+    )
+
+def invalidate_guild_descriptions(guild_id: int):
+    """Drop the in-process descriptions for a guild (emoji set changed)."""
+    for key in [key for key in _description_cache if key[0] == guild_id]:
+        del _description_cache[key]
+
 async def get_custom_emoji_description(emoji: discord.Emoji, db_manager: DatabaseManager) -> Optional[str]:
     """
     Get a description of a custom server emoji using a multimodal model.
-    Uses database caching to avoid repeated processing.
+    Uses in-process and database caching to avoid repeated processing.
     """
     logger.debug(f"Getting description for custom emoji: {emoji.name} (ID: {emoji.id}) in guild: {emoji.guild.name} (ID: {emoji.guild.id})")
-    
-    # Check database cache first
+
+    # In-process cache first: skips even the database round trip for emojis
+    # that chat traffic keeps asking about
+    in_process = _cached_description(emoji.guild.id, emoji.id)
+    if in_process:
+        return in_process
+
+    # Check database cache next
     logger.debug(f"Checking database cache for emoji {emoji.name}")
     cached_description = await db_manager.get_emoji_description(emoji.guild.id, emoji.name)
     if cached_description:
         logger.debug(f"Using cached description for emoji {emoji.name}: {cached_description}")
+        _remember_description(emoji.guild.id, emoji.id, cached_description)
         return cached_description
     
     # Get the vision model from config
@@ -117,52 +282,66 @@ async def get_custom_emoji_description(emoji: discord.Emoji, db_manager: Databas
         description = f"Custom server emoji: {emoji.name}"
         logger.debug(f"Saving text description for emoji {emoji.name}: {description}")
         await db_manager.save_emoji_description(emoji.guild.id, emoji.name, description)
+        _remember_description(emoji.guild.id, emoji.id, description)
         return description
     
     # For vision models, try to get actual visual description
     logger.debug("Model is vision capable, attempting visual description")
     try:
-        # Download emoji image
-        logger.debug(f"Downloading emoji image from URL: {emoji.url}")
-        image_bytes = download_emoji_image(str(emoji.url))
-        if not image_bytes:
-            logger.warning(f"Could not download emoji image for {emoji.name}, using text description")
-            # Fallback to text description
-            description = f"Custom server emoji: {emoji.name}"
-            await db_manager.save_emoji_description(emoji.guild.id, emoji.name, description)
-            return description
-        
-        # Encode image
-        logger.debug("Encoding image to base64")
-        base64_image = encode_image_to_base64(image_bytes)
-        
+        emoji_url = str(emoji.url)
+        if _is_passthrough_image_url(emoji_url):
+            # The provider fetches Discord CDN URLs itself; skip the
+            # download and base64 encode entirely
+            logger.debug(f"Passing CDN URL straight to the vision model: {emoji_url}")
+            image_data_uri = emoji_url
+        else:
+            # Download emoji image
+            logger.debug(f"Downloading emoji image from URL: {emoji_url}")
+            image_bytes = await download_emoji_image_async(emoji_url)
+            if not image_bytes:
+                logger.warning(f"Could not download emoji image for {emoji.name}, using text description")
+                # Fallback to text description
+                description = f"Custom server emoji: {emoji.name}"
+                await db_manager.save_emoji_description(emoji.guild.id, emoji.name, description)
+                _remember_description(emoji.guild.id, emoji.id, description)
+                return description
+
+            # Encode image directly into a data URI
+            logger.debug("Encoding image as data URI")
+            image_data_uri = encode_image_as_data_uri(image_bytes, animated=bool(getattr(emoji, 'animated', False)))
+
         # Create prompt for vision model
         prompt = f"What is in this custom server emoji? Describe it in one sentence."
         logger.debug(f"Vision model prompt: {prompt}")
         
         # Call vision model
         logger.debug("Calling vision model for emoji description")
-        response = litellm.completion(
-            model=model,
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/png;base64,{base64_image}"
+        async with _get_vision_semaphore():
+            response = await _vision_completion(
+                model=model,
+                timeout=60,  # Vision calls can be slow, but not unbounded
+                num_retries=2,
+                max_tokens=EMOJI_DESCRIPTION_MAX_TOKENS,  # One-sentence answer
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {"type": "text", "text": prompt},
+                            {
+                                "type": "image_url",
+                                "image_url": {
+                                    "url": image_data_uri
+                                }
                             }
-                        }
-                    ]
-                }
-            ]
-        )
+                        ]
+                    }
+                ]
+            )
         
         description = response.choices[0].message.content
         logger.debug(f"Vision model response: {description}")
         await db_manager.save_emoji_description(emoji.guild.id, emoji.name, description)
+        _remember_description(emoji.guild.id, emoji.id, description)
         logger.debug(f"Saved visual description for emoji {emoji.name}")
         return description
         
@@ -171,9 +350,123 @@ async def get_custom_emoji_description(emoji: discord.Emoji, db_manager: Databas
         # Fallback to simple text description
         description = f"Custom server emoji: {emoji.name}"
         await db_manager.save_emoji_description(emoji.guild.id, emoji.name, description)
+        _remember_description(emoji.guild.id, emoji.id, description)
         logger.debug(f"Saved fallback text description for emoji {emoji.name}")
         return description
 
+# How many emoji images to include in a single vision request
+EMOJI_VISION_BATCH_SIZE = 4
+
+# Descriptions are one sentence, so cap the completion instead of letting
+# the model ramble at full context length
+EMOJI_DESCRIPTION_MAX_TOKENS = 128
+
+# Matches "1. description", "2) description" or "3: description" lines
+_NUMBERED_LINE_PATTERN = re.compile(r'^\s*(\d+)[.):]\s*(.+)$')
+
+def _parse_numbered_descriptions(text: str, expected: int) -> Optional[List[str]]:
+    """Parse a numbered-list vision response into one description per emoji."""
+    if not text:
+        return None
+    items = {}
+    for line in text.splitlines():
+        match = _NUMBERED_LINE_PATTERN.match(line)
+        if match:
+            items[int(match.group(1))] = match.group(2).strip()
+    try:
+        return [items[i] for i in range(1, expected + 1)]
+    except KeyError:
+        logger.debug(f"Batch vision response had {len(items)} usable lines, expected {expected}")
+        return None
+
+async def get_custom_emoji_descriptions_batch(emojis: List[discord.Emoji], db_manager: DatabaseManager) -> Dict[str, str]:
+    """
+    Describe several uncached emojis, packing multiple images into each
+    vision request instead of one call per emoji. Falls back to the
+    per-emoji path when the batched response can't be parsed.
+    """
+    descriptions = {}
+    if not emojis:
+        return descriptions
+
+    model = get_vision_model()
+    if not is_vision_capable_model(model):
+        # Text descriptions are cheap; no batching needed
+        for emoji in emojis:
+            descriptions[emoji.name] = await get_custom_emoji_description(emoji, db_manager)
+        return descriptions
+
+    logger.debug(f"Batch describing {len(emojis)} emojis with model {model}")
+
+    async def _image_payload(emoji):
+        """The image_url value for one emoji: the CDN URL itself when the
+        provider can fetch it, otherwise a downloaded data URI."""
+        url = str(emoji.url)
+        if _is_passthrough_image_url(url):
+            return url
+        image = await download_emoji_image_async(url)
+        if not image:
+            return None
+        return encode_image_as_data_uri(image, animated=bool(getattr(emoji, 'animated', False)))
+
+    payloads = await asyncio.gather(*(_image_payload(emoji) for emoji in emojis))
+    pending = list(zip(emojis, payloads))
+
+    for start in range(0, len(pending), EMOJI_VISION_BATCH_SIZE):
+        batch = pending[start:start + EMOJI_VISION_BATCH_SIZE]
+        with_images = [(emoji, payload) for emoji, payload in batch if payload]
+
+        # Emojis whose image couldn't be downloaded get the text fallback
+        for emoji, payload in batch:
+            if not payload:
+                description = f"Custom server emoji: {emoji.name}"
+                await db_manager.save_emoji_description(emoji.guild.id, emoji.name, description)
+                _remember_description(emoji.guild.id, emoji.id, description)
+                descriptions[emoji.name] = description
+
+        if not with_images:
+            continue
+
+        parsed = None
+        try:
+            content = [{
+                "type": "text",
+                "text": (
+                    f"Here are {len(with_images)} custom server emojis. Describe each one "
+                    "in one sentence. Reply with one numbered line per emoji, in order."
+                ),
+            }]
+            for index, (emoji, payload) in enumerate(with_images, 1):
+                content.append({"type": "text", "text": f"{index}. {emoji.name}"})
+                content.append({
+                    "type": "image_url",
+                    "image_url": {"url": payload}
+                })
+            async with _get_vision_semaphore():
+                response = await _vision_completion(
+                    model=model,
+                    messages=[{"role": "user", "content": content}],
+                    timeout=60,
+                    num_retries=2,
+                    # One numbered sentence per emoji in the batch
+                    max_tokens=EMOJI_DESCRIPTION_MAX_TOKENS * len(with_images)
+                )
+            parsed = _parse_numbered_descriptions(response.choices[0].message.content, len(with_images))
+        except Exception as e:
+            logger.warning(f"Batched vision call failed: {e}")
+
+        if parsed is None:
+            # Batch didn't work out; describe these emojis individually
+            for emoji, payload in with_images:
+                descriptions[emoji.name] = await get_custom_emoji_description(emoji, db_manager)
+        else:
+            for (emoji, payload), description in zip(with_images, parsed):
+                await db_manager.save_emoji_description(emoji.guild.id, emoji.name, description)
+                _remember_description(emoji.guild.id, emoji.id, description)
+                descriptions[emoji.name] = description
+
+    return descriptions
+
 async def analyze_server_emojis(guild: discord.Guild, db_manager: DatabaseManager) -> Dict[str, str]:
     """
     Analyze all custom emojis in a server and return descriptions.
@@ -190,61 +483,72 @@ async def analyze_server_emojis(guild: discord.Guild, db_manager: DatabaseManage
         emojis = [emoji for emoji in guild.emojis]
         logger.debug(f"Found {len(emojis)} custom emojis in guild")
         
-        # Get descriptions for each emoji
-        for emoji in emojis:
-            logger.debug(f"Processing emoji: {emoji.name}")
-            description = await get_custom_emoji_description(emoji, db_manager)
-            if description:
-                emoji_descriptions[str(emoji)] = description
-                logger.debug(f"Added description for emoji {emoji.name}")
-            else:
-                logger.debug(f"No description returned for emoji {emoji.name}")
+        # Get descriptions for all emojis concurrently; most resolve from the
+        # database cache, and the few that need a vision call overlap instead
+        # of queuing behind each other
+        if emojis:
+            results = await asyncio.gather(
+                *(get_custom_emoji_description(emoji, db_manager) for emoji in emojis),
+                return_exceptions=True,
+            )
+            for emoji, description in zip(emojis, results):
+                if isinstance(description, Exception):
+                    logger.warning(f"Could not get description for emoji {emoji.name}: {description}")
+                elif description:
+                    emoji_descriptions[str(emoji)] = description
+                    logger.debug(f"Added description for emoji {emoji.name}")
+                else:
+                    logger.debug(f"No description returned for emoji {emoji.name}")
     except Exception as e:
         logger.error(f"Error analyzing server emojis: {e}")
     
     logger.debug(f"Returning {len(emoji_descriptions)} emoji descriptions")
     return emoji_descriptions
 
-async def create_enhanced_emoji_prompt(guild: discord.Guild, db_manager: DatabaseManager) -> str:
-    """
-    Create an enhanced emoji prompt with descriptions for better AI understanding.
-    """
-    logger.debug(f"Creating enhanced emoji prompt for guild: {guild.name if guild else 'None'} (ID: {guild.id if guild else 'None'})")
-    emoji_descriptions = await analyze_server_emojis(guild, db_manager)
-    logger.debug(f"Retrieved {len(emoji_descriptions)} emoji descriptions")
-    
-    if not emoji_descriptions:
-        logger.debug("No emoji descriptions found, falling back to simple emoji prompt")
-        # Fall back to the simple emoji prompt
-        from src.utils.emoji_helper import create_emoji_prompt
-        simple_prompt = create_emoji_prompt(guild)
-        logger.debug(f"Simple emoji prompt: {simple_prompt}")
-        return simple_prompt
-    
-    # Create detailed prompt with emoji descriptions
-    logger.debug("Creating detailed prompt with emoji descriptions")
+@lru_cache(maxsize=32)
+def _format_enhanced_emoji_prompt(description_items) -> str:
+    """Render the enhanced emoji prompt from (emoji_key, description) pairs."""
     prompt_lines = ["\n\nAvailable server emojis with descriptions:"]
-    
+
     # Convert Discord emoji format to curly brace format for AI consumption
-    for emoji_key, description in emoji_descriptions.items():
+    for emoji_key, description in description_items:
         # Extract emoji name from Discord format <:emoji_name:123456789>
         if emoji_key.startswith("<:") and ":" in emoji_key:
             # Extract the emoji name (between the first and last colon)
             emoji_name = emoji_key.split(":")[1]
             # Format for AI consumption using curly braces
             prompt_lines.append(f"- {{{emoji_name}}}: {description}")
-            logger.debug(f"Added emoji description: {{{emoji_name}}}: {description}")
         else:
             # If it's already in the right format or is a Unicode emoji, use as-is
             prompt_lines.append(f"- {emoji_key}: {description}")
-            logger.debug(f"Added emoji description: {emoji_key}: {description}")
-    
+
     prompt_lines.append("\nPlease prioritize using these server emojis liberally and frequently to enhance communication and add personality to your responses.")
     prompt_lines.append("Use multiple emojis in a single message when appropriate to express emotions or reactions.")
     prompt_lines.append("Use emojis to 'spice things up' and make conversations more engaging.")
     prompt_lines.append("Remember to use the curly brace format {emoji_name} for custom server emojis.")
     prompt_lines.append("Do NOT use the Discord emoji format like <:emoji_name:123456789>.")
+
+    return "\n".join(prompt_lines)
+
+async def create_enhanced_emoji_prompt(guild: discord.Guild, db_manager: DatabaseManager) -> str:
+    """
+    Create an enhanced emoji prompt with descriptions for better AI understanding.
+    """
+    logger.debug(f"Creating enhanced emoji prompt for guild: {guild.name if guild else 'None'} (ID: {guild.id if guild else 'None'})")
+    emoji_descriptions = await analyze_server_emojis(guild, db_manager)
+    logger.debug(f"Retrieved {len(emoji_descriptions)} emoji descriptions")
     
-    prompt = "\n".join(prompt_lines)
+    if not emoji_descriptions:
+        logger.debug("No emoji descriptions found, falling back to simple emoji prompt")
+        # Fall back to the simple emoji prompt
+        from src.utils.emoji_helper import create_emoji_prompt
+        simple_prompt = create_emoji_prompt(guild)
+        logger.debug(f"Simple emoji prompt: {simple_prompt}")
+        return simple_prompt
+    
+    # Create detailed prompt with emoji descriptions; the formatting itself
+    # is memoized on the description items since those rarely change
+    logger.debug("Creating detailed prompt with emoji descriptions")
+    prompt = _format_enhanced_emoji_prompt(tuple(emoji_descriptions.items()))
     logger.debug(f"Enhanced emoji prompt created (first 200 chars): {prompt[:200]}...")
     return prompt
\ No newline at end of file
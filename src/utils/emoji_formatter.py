@@ -7,6 +7,19 @@ from typing import List, Dict, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns; these are applied to every outgoing message, so
+# compile them once at import instead of on each call
+DISCORD_EMOJI_PATTERN = re.compile(r'<:(\w+):\d+>')
+# Single-pass tokenizer: matches either an existing {emoji_name} expression
+# (left untouched) or a word that might be an emoji name (group 1)
+EMOJI_TOKEN_PATTERN = re.compile(r'\{[^}]+\}|\b([a-zA-Z][a-zA-Z0-9_]{1,29})\b')
+
+# Common words that are unlikely to be emoji names; built once instead of
+# per replacement callback
+COMMON_WORDS = frozenset({
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'its', 'may', 'new', 'now', 'old', 'see', 'two', 'who', 'boy', 'did', 'man', 'men', 'put', 'too', 'use', 'any', 'big', 'end', 'far', 'got', 'hot', 'let', 'lot', 'run', 'sat', 'say', 'she', 'sit', 'try', 'up', 'way', 'win', 'yes'
+})
+
 def format_emojis_for_discord(text: str, guild: discord.Guild) -> str:
     """
     Ensure all emojis in the text are properly formatted for Discord.
@@ -35,6 +48,8 @@ def format_emojis_for_discord(text: str, guild: discord.Guild) -> str:
             return []
 
     guild_emojis = _get_guild_emojis(guild)
+    # One dict build replaces a linear scan per candidate name
+    emoji_names = {getattr(e, 'name', None) for e in guild_emojis}
     
     # First, let's identify all potential emoji patterns in the text
     # This includes:
@@ -42,47 +57,43 @@ def format_emojis_for_discord(text: str, guild: discord.Guild) -> str:
     # 2. Custom emojis in Discord format: <:emoji_name:123456789>
     # 3. Potential emoji names that might be custom emojis
     
-    # Pattern to match Discord custom emoji format: <:emoji_name:123456789>
-    discord_emoji_pattern = r'<:(\w+):\d+>'
-    
     def replace_discord_emoji(match):
         emoji_name = match.group(1)
         logger.debug(f"Found Discord emoji format, converting to curly brace format: {emoji_name}")
         # Check if this is a valid custom emoji in the guild
-        emoji_obj = discord.utils.get(guild_emojis, name=emoji_name)
-        if emoji_obj:
+        if emoji_name in emoji_names:
             # Valid custom emoji, convert to curly brace format
             return f"{{{emoji_name}}}"
         else:
             # Not a valid custom emoji, leave as-is
             return match.group(0)
     
-    # Replace Discord emoji format with curly brace format
-    result = re.sub(discord_emoji_pattern, replace_discord_emoji, text)
+    # Replace Discord emoji format with curly brace format; the substring
+    # check skips the regex entirely for the common emoji-free message
+    if '<:' in text:
+        result = DISCORD_EMOJI_PATTERN.sub(replace_discord_emoji, text)
+    else:
+        result = text
     logger.debug(f"Text after Discord emoji conversion: {result[:100]}...")
     
     # Pattern to match potential emoji names that might be custom emojis
     # This is a bit tricky as we don't want to match every word
     # We'll look for words that are likely to be emoji names based on common patterns
     # Emoji names typically contain only alphanumeric characters and underscores
-    potential_emoji_pattern = r'\b([a-zA-Z][a-zA-Z0-9_]{1,29})\b'
-    
     def replace_potential_emoji(match):
         potential_name = match.group(1)
+        if potential_name is None:
+            # Matched an existing {emoji_name} expression; leave it untouched
+            return match.group(0)
         logger.debug(f"Checking potential emoji name: {potential_name}")
-        
+
         # Skip common words that are unlikely to be emoji names
-        common_words = {
-            'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'her', 'was', 'one', 'our', 'out', 'day', 'get', 'has', 'him', 'his', 'how', 'its', 'may', 'new', 'now', 'old', 'see', 'two', 'who', 'boy', 'did', 'man', 'men', 'put', 'too', 'use', 'any', 'big', 'end', 'far', 'got', 'hot', 'let', 'lot', 'run', 'sat', 'say', 'she', 'sit', 'try', 'up', 'way', 'win', 'yes'
-        }
-        
-        if potential_name.lower() in common_words:
+        if potential_name.lower() in COMMON_WORDS:
             logger.debug(f"Skipping common word: {potential_name}")
             return match.group(0)
         
         # Check if this is a valid custom emoji in the guild
-        emoji_obj = discord.utils.get(guild_emojis, name=potential_name)
-        if emoji_obj:
+        if potential_name in emoji_names:
             logger.debug(f"Found valid custom emoji, converting to curly brace format: {potential_name}")
             # Valid custom emoji, ensure it's in curly brace format
             # But only if it's not already in curly braces (which we handled earlier)
@@ -92,18 +103,9 @@ def format_emojis_for_discord(text: str, guild: discord.Guild) -> str:
             logger.debug(f"Not a valid custom emoji: {potential_name}")
             return match.group(0)
     
-    # Apply this replacement only to text that's not already in curly braces
-    # We'll use a more complex approach to avoid matching text inside curly braces
-    def process_text_outside_braces(text):
-        # Split text by curly braces to process only outside parts
-        parts = re.split(r'(\{[^}]+\})', text)
-        for i, part in enumerate(parts):
-            # Only process parts that are not curly brace expressions
-            if not (part.startswith('{') and part.endswith('}')):
-                parts[i] = re.sub(potential_emoji_pattern, replace_potential_emoji, part)
-        return ''.join(parts)
-    
-    result = process_text_outside_braces(result)
+    # One pass over the text handles both cases: brace expressions are
+    # skipped by the tokenizer alternation, candidate words are checked
+    result = EMOJI_TOKEN_PATTERN.sub(replace_potential_emoji, result)
     logger.debug(f"Text after potential emoji conversion: {result[:100]}...")
     
     return result
@@ -120,9 +122,9 @@ def validate_emoji_formatting(text: str) -> bool:
     """
     logger.debug(f"Validating emoji formatting in text: {text[:100]}...")
     
-    # Check for any Discord emoji format that should be converted
-    discord_emoji_pattern = r'<:(\w+):\d+>'
-    if re.search(discord_emoji_pattern, text):
+    # Check for any Discord emoji format that should be converted; skip the
+    # regex when the '<:' marker isn't present at all
+    if '<:' in text and DISCORD_EMOJI_PATTERN.search(text):
         logger.debug("Found unconverted Discord emoji format")
         return False
     
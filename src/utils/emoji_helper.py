@@ -2,44 +2,71 @@
 
 import discord
 import random
+from functools import lru_cache
+
+# Formatted {name} lists per guild, keyed by the guild's emoji fingerprint so
+# an emoji change misses naturally instead of needing an invalidation hook.
+# Cleared wholesale when full, like the caches in emoji_parser.
+_EMOJI_LIST_CACHE_MAXSIZE = 64
+_emoji_list_cache = {}  # (guild_id, fingerprint) -> formatted name list
+
+def _formatted_server_emojis(guild):
+    """The cached curly-brace name list for a guild, or None for mocks."""
+    try:
+        fingerprint = tuple((emoji.id, emoji.name) for emoji in guild.emojis)
+    except (TypeError, AttributeError):
+        # If guild.emojis is not iterable (e.g., in tests), skip caching
+        return None
+    key = (guild.id, fingerprint)
+    entry = _emoji_list_cache.get(key)
+    if entry is None:
+        if len(_emoji_list_cache) >= _EMOJI_LIST_CACHE_MAXSIZE:
+            _emoji_list_cache.clear()
+        entry = [f"{{{emoji.name}}}" for emoji in guild.emojis]
+        _emoji_list_cache[key] = entry
+    return entry
 
 def get_server_emojis(guild):
     """Get a list of server emojis from a guild."""
     if guild is None:
         return []
-    
-    # Handle mock objects in tests
-    try:
-        # Return a list of emoji names in curly brace format for AI consumption
-        # The AI should use {emoji_name} format, which will be converted to actual emojis later
-        return [f"{{{emoji.name}}}" for emoji in guild.emojis]
-    except (TypeError, AttributeError):
-        # If guild.emojis is not iterable (e.g., in tests), return empty list
-        return []
+
+    # Return a list of emoji names in curly brace format for AI consumption
+    # The AI should use {emoji_name} format, which will be converted to actual
+    # emojis later. Cached per guild; callers must not mutate the result.
+    emojis = _formatted_server_emojis(guild)
+    return emojis if emojis is not None else []
 
 def get_random_emojis(guild, count=2):
     """Get a random selection of server emojis."""
-    server_emojis = get_server_emojis(guild)
-    
-    # If we don't have enough server emojis, we can supplement with standard emojis
-    # For now, we'll just return what we have or a subset
-    if len(server_emojis) == 0:
+    if guild is None:
         return []
-    
-    # Return up to 'count' random emojis
-    return random.sample(server_emojis, min(count, len(server_emojis)))
 
-def create_emoji_prompt(guild):
-    """Create a prompt string with available server emojis."""
-    server_emojis = get_server_emojis(guild)
-    
-    if not server_emojis:
-        return ""
-    
+    formatted = _formatted_server_emojis(guild)
+    if not formatted:
+        return []
+
+    # Sample from the prebuilt list instead of re-formatting every emoji in
+    # the guild on each call
+    return random.sample(formatted, min(count, len(formatted)))
+
+@lru_cache(maxsize=32)
+def _render_emoji_prompt(server_emojis):
+    """Render the emoji prompt for a tuple of formatted emoji names."""
     emoji_list = ", ".join(server_emojis)
     return f"""
 
 Available server emojis: {emoji_list}
 Please prioritize using these server emojis liberally and frequently to enhance communication and add personality to your responses.
 Remember to use the curly brace format {{emoji_name}} for custom server emojis.
-Do NOT use the Discord emoji format like <:emoji_name:123456789>."""""
\ No newline at end of file
+Do NOT use the Discord emoji format like <:emoji_name:123456789>."""
+
+def create_emoji_prompt(guild):
+    """Create a prompt string with available server emojis."""
+    server_emojis = get_server_emojis(guild)
+
+    if not server_emojis:
+        return ""
+
+    # Memoized per emoji-name tuple; the guild's emoji set rarely changes
+    return _render_emoji_prompt(tuple(server_emojis))
\ No newline at end of file
@@ -4,18 +4,74 @@ import asyncio
 import logging
 import discord
 from typing import Dict, List, Set
-from src.utils.emoji_analyzer import get_custom_emoji_description, analyze_server_emojis
+from src.utils.emoji_analyzer import get_custom_emoji_description, get_custom_emoji_descriptions_batch, analyze_server_emojis, invalidate_guild_descriptions
 from src.database.manager import DatabaseManager
 
 logger = logging.getLogger(__name__)
 
+# How many guilds to cache concurrently; replaces the old one-guild-at-a-time
+# loop with a fixed sleep between guilds
+MAX_CONCURRENT_GUILD_CACHING = 3
+
 class EmojiManager:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         self.cached_emojis: Dict[int, Set[str]] = {}  # guild_id -> set of emoji names
+        # guild_id -> frozenset of (emoji id, name); lets a caching cycle skip
+        # guilds whose emoji set hasn't changed without touching the database
+        self._guild_fingerprints: Dict[int, frozenset] = {}
         self.background_task = None
-        self.is_caching = False  # Flag to indicate if caching is in progress
-        
+        # Event that is clear while caching is in progress and set when done.
+        # Hot paths can do a single ready.is_set() check (or await the event)
+        # instead of calling is_caching_in_progress() per message.
+        self.ready = asyncio.Event()
+        self.ready.set()
+
+    @property
+    def is_caching(self) -> bool:
+        """Whether emoji caching is currently in progress."""
+        return not self.ready.is_set()
+
+    @is_caching.setter
+    def is_caching(self, value: bool):
+        if value:
+            self.ready.clear()
+        else:
+            self.ready.set()
+
+
+    async def _cache_all_guilds(self, bot):
+        """
+        Cache emojis for every guild, a few guilds at a time.
+        """
+        guilds = list(bot.guilds)
+        logger.debug(f"Caching emojis for {len(guilds)} guilds")
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_GUILD_CACHING)
+
+        # One bulk query for every guild's cached keys beats a LIKE query
+        # per guild during the cycle
+        cached_names_by_guild = None
+        try:
+            cached_names_by_guild = {}
+            for key in await self.db_manager.get_all_emoji_keys():
+                guild_part, _, emoji_name = key.partition(':')
+                cached_names_by_guild.setdefault(guild_part, set()).add(emoji_name)
+        except Exception as e:
+            logger.warning(f"Failed to bulk-load cached emoji keys, falling back to per-guild queries: {e}")
+            cached_names_by_guild = None
+
+        async def cache_one(guild):
+            async with semaphore:
+                cached_names = None
+                if cached_names_by_guild is not None:
+                    cached_names = cached_names_by_guild.get(str(guild.id), set())
+                await self._cache_guild_emojis(guild, cached_names=cached_names)
+
+        results = await asyncio.gather(*(cache_one(guild) for guild in guilds), return_exceptions=True)
+        for guild, result in zip(guilds, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error caching emojis for guild {guild.id}: {result}")
+
     async def start_background_caching(self, bot):
         """
         Start background caching of emojis for all guilds the bot is in.
@@ -36,21 +92,16 @@ class EmojiManager:
                 # Cache emojis for all guilds
                 self.is_caching = True
                 logger.debug("Set is_caching flag to True")
-                guild_count = len(bot.guilds)
-                logger.debug(f"Caching emojis for {guild_count} guilds")
-                for i, guild in enumerate(bot.guilds):
-                    logger.debug(f"Processing guild {i+1}/{guild_count}: {guild.name} (ID: {guild.id})")
-                    await self._cache_guild_emojis(guild)
-                    # Add a small delay between processing each guild to prevent overwhelming the system
-                    logger.debug("Waiting 1 second before processing next guild")
-                    await asyncio.sleep(1)
+                await self._cache_all_guilds(bot)
                 self.is_caching = False
                 logger.debug("Set is_caching flag to False")
                 logger.debug("Emoji caching cycle completed")
                 
-                # Wait for a period before next check (e.g., 30 minutes)
-                logger.debug("Sleeping for 30 minutes before next caching cycle")
-                await asyncio.sleep(30 * 60)  # 30 minutes
+                # The on_guild_emojis_update event refreshes guilds as they
+                # change; this periodic scan is only a safety net for missed
+                # gateway events, so it can run rarely
+                logger.debug("Sleeping for 6 hours before next caching cycle")
+                await asyncio.sleep(6 * 60 * 60)  # 6 hours
             except asyncio.CancelledError:
                 logger.info("Background emoji caching task cancelled")
                 self.is_caching = False
@@ -74,60 +125,76 @@ class EmojiManager:
         """
         Check if emoji caching is currently in progress.
         """
-        logger.debug(f"Checking if emoji caching is in progress: {self.is_caching}")
-        return self.is_caching
+        return not self.ready.is_set()
                 
-    async def _cache_guild_emojis(self, guild: discord.Guild):
+    async def _cache_guild_emojis(self, guild: discord.Guild, cached_names: Set[str] = None):
         """
         Cache all emojis for a specific guild.
+
+        cached_names can be supplied by a bulk pre-fetch (see
+        _cache_all_guilds); when omitted it is queried per guild.
         """
-        logger.debug(f"Caching emojis for guild: {guild.name if guild else 'None'} (ID: {guild.id if guild else 'None'})")
+        # Lazy %-style logging here: this runs for every guild each cycle and
+        # the f-strings were formatting whole emoji-name sets even when debug
+        # logging was off
         if guild is None:
             logger.debug("Guild is None, returning")
             return
-            
+        logger.debug("Caching emojis for guild: %s (ID: %s)", guild.name, guild.id)
+
         try:
-            logger.info(f"Caching emojis for guild: {guild.name} ({guild.id})")
-            
+            # Skip guilds whose emoji set matches what we processed last time
+            try:
+                fingerprint = frozenset((emoji.id, emoji.name) for emoji in guild.emojis)
+            except (TypeError, AttributeError):
+                fingerprint = None
+            if fingerprint is not None and self._guild_fingerprints.get(guild.id) == fingerprint:
+                logger.debug("Emoji set unchanged for guild %s, skipping", guild.id)
+                return
+
+            logger.info("Caching emojis for guild: %s (%s)", guild.name, guild.id)
+
             # Get current emojis
-            logger.debug("Getting current emoji names")
             current_emoji_names = {emoji.name for emoji in guild.emojis}
-            logger.debug(f"Found {len(current_emoji_names)} current emojis: {current_emoji_names}")
-            
+            logger.debug("Found %d current emojis: %s", len(current_emoji_names), current_emoji_names)
+
             # Check database for cached emojis for this guild
-            logger.debug(f"Getting cached emoji keys for guild {guild.id}")
-            cached_names = await self._get_cached_emoji_keys_for_guild(guild.id)
-            logger.debug(f"Found {len(cached_names)} cached emojis: {cached_names}")
-            
+            if cached_names is None:
+                logger.debug("Getting cached emoji keys for guild %s", guild.id)
+                cached_names = await self._get_cached_emoji_keys_for_guild(guild.id)
+            logger.debug("Found %d cached emojis: %s", len(cached_names), cached_names)
+
             # Find new emojis
             new_emoji_names = current_emoji_names - cached_names
             removed_emoji_names = cached_names - current_emoji_names
-            logger.debug(f"New emojis to cache: {len(new_emoji_names)}")
-            logger.debug(f"Removed emojis to delete: {len(removed_emoji_names)}")
-            
-            # Handle removed emojis
-            logger.debug("Processing removed emojis")
-            for emoji_name in removed_emoji_names:
-                logger.debug(f"Removing cached emoji: {emoji_name}")
-                await self._remove_emoji_from_cache(guild.id, emoji_name)
-                
-            # Handle new emojis
-            logger.debug("Processing new emojis")
-            new_emojis = [emoji for emoji in guild.emojis if emoji.name in new_emoji_names]
-            logger.debug(f"Found {len(new_emojis)} new emojis to process")
-            for emoji in new_emojis:
+            logger.debug("New emojis to cache: %d", len(new_emoji_names))
+            logger.debug("Removed emojis to delete: %d", len(removed_emoji_names))
+
+            # Handle removed emojis in one batched delete
+            if removed_emoji_names:
+                await self._remove_emojis_from_cache(guild.id, removed_emoji_names)
+
+            # Handle new emojis; don't walk guild.emojis at all when nothing
+            # is new, which is the common case outside the first pass
+            new_emojis = [emoji for emoji in guild.emojis if emoji.name in new_emoji_names] if new_emoji_names else []
+            logger.debug("Found %d new emojis to process", len(new_emojis))
+            if new_emojis:
                 try:
-                    logger.debug(f"Processing new emoji: {emoji.name} (ID: {emoji.id})")
-                    await get_custom_emoji_description(emoji, self.db_manager)
-                    logger.debug(f"Cached emoji: {emoji.name}")
+                    # Describe new emojis in batches, packing several images
+                    # per vision request instead of one call each
+                    await get_custom_emoji_descriptions_batch(new_emojis, self.db_manager)
+                    logger.debug("Cached %d new emojis", len(new_emojis))
                 except Exception as e:
-                    logger.warning(f"Failed to cache emoji {emoji.name}: {e}")
-            
-            logger.info(f"Finished caching emojis for guild: {guild.name}. "
-                       f"New: {len(new_emojis)}, Removed: {len(removed_emoji_names)}")
-                       
+                    logger.warning("Failed to cache new emojis for guild %s: %s", guild.id, e)
+
+            if fingerprint is not None:
+                self._guild_fingerprints[guild.id] = fingerprint
+
+            logger.info("Finished caching emojis for guild: %s. New: %d, Removed: %d",
+                        guild.name, len(new_emojis), len(removed_emoji_names))
+
         except Exception as e:
-            logger.error(f"Error caching emojis for guild {guild.id}: {e}")
+            logger.error("Error caching emojis for guild %s: %s", guild.id, e)
             
     async def _remove_emoji_from_cache(self, guild_id: int, emoji_name: str):
         """
@@ -139,6 +206,17 @@ class EmojiManager:
             logger.debug(f"Removed emoji from cache: {guild_id}:{emoji_name}")
         except Exception as e:
             logger.warning(f"Failed to remove emoji {emoji_name} from cache: {e}")
+
+    async def _remove_emojis_from_cache(self, guild_id: int, emoji_names: Set[str]):
+        """
+        Remove several emojis from the database cache with a single delete.
+        """
+        logger.debug("Removing %d emojis from cache for guild %s", len(emoji_names), guild_id)
+        try:
+            await self.db_manager.remove_emoji_descriptions(guild_id, sorted(emoji_names))
+            invalidate_guild_descriptions(guild_id)
+        except Exception as e:
+            logger.warning("Failed to remove emojis from cache for guild %s: %s", guild_id, e)
             
     async def _get_cached_emoji_keys_for_guild(self, guild_id: int) -> Set[str]:
         """
@@ -165,14 +243,7 @@ class EmojiManager:
         try:
             self.is_caching = True
             logger.debug(f"Set is_caching flag to True for startup caching")
-            guild_count = len(bot.guilds)
-            logger.debug(f"Caching emojis for {guild_count} guilds on startup")
-            for i, guild in enumerate(bot.guilds):
-                logger.debug(f"Processing guild {i+1}/{guild_count} on startup: {guild.name} (ID: {guild.id})")
-                await self._cache_guild_emojis(guild)
-                # Add a small delay between processing each guild to prevent overwhelming the system
-                logger.debug("Waiting 1 second before processing next guild")
-                await asyncio.sleep(1)
+            await self._cache_all_guilds(bot)
             self.is_caching = False
             logger.debug(f"Set is_caching flag to False after startup caching")
             logger.info("Finished emoji caching on startup")
@@ -5,22 +5,91 @@ import re
 import logging
 from typing import List, Dict, Tuple, Optional
 
+import emoji as emoji_lib
+
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; these run on every AI response
+EMOJI_TAG_PATTERN = re.compile(r'\{([^{}]+)\}')
+
+# Every known Unicode emoji sequence; replaces the old "short and
+# non-ASCII" heuristic with an exact O(1) membership test
+_UNICODE_EMOJI = frozenset(emoji_lib.EMOJI_DATA)
+
+def is_unicode_emoji(text: str) -> bool:
+    """Check whether text is a standard Unicode emoji."""
+    return text in _UNICODE_EMOJI
+
+# Cache of fully-replaced responses keyed by (guild id, emoji fingerprint,
+# text); repeated or retried responses skip the regex pass entirely. Cleared
+# wholesale when full rather than tracking LRU order.
+_REPLACE_CACHE_MAXSIZE = 256
+_replace_cache: Dict[tuple, str] = {}
+
+# Per-guild compiled alternation pattern over the known emoji names plus the
+# name -> rendered emoji table, rebuilt only when the emoji set changes
+_ALTERNATION_CACHE_MAXSIZE = 64
+_alternation_cache: Dict[tuple, tuple] = {}
+
+def _guild_replacement_table(guild: discord.Guild):
+    """
+    Get (pattern, table) for a guild, where pattern matches exactly the
+    guild's emoji names in braces and table maps each name to its Discord
+    rendering. Returns None when guild.emojis isn't iterable.
+    """
+    try:
+        fingerprint = tuple((emoji.id, emoji.name) for emoji in guild.emojis)
+        key = (guild.id, fingerprint)
+    except (TypeError, AttributeError):
+        return None
+    entry = _alternation_cache.get(key)
+    if entry is None:
+        table = {emoji.name: str(emoji) for emoji in guild.emojis}
+        if table:
+            pattern = re.compile(r'\{(' + '|'.join(re.escape(name) for name in table) + r')\}')
+        else:
+            pattern = None
+        if len(_alternation_cache) >= _ALTERNATION_CACHE_MAXSIZE:
+            _alternation_cache.clear()
+        entry = (pattern, table)
+        _alternation_cache[key] = entry
+    return entry
+
+def _replace_unicode_or_keep(match) -> str:
+    """Unwrap {emoji} for Unicode emojis, keep unknown tags untouched."""
+    emoji_name = match.group(1)
+    if is_unicode_emoji(emoji_name):
+        return emoji_name
+    logger.debug(f"Emoji {emoji_name} not found, keeping original tag")
+    return match.group(0)
+
+def _guild_emoji_map(guild: discord.Guild) -> Dict[str, discord.Emoji]:
+    """
+    Build a name -> emoji dict for a guild so repeated lookups are O(1)
+    instead of scanning guild.emojis per tag.
+    """
+    try:
+        return {emoji.name: emoji for emoji in guild.emojis}
+    except (TypeError, AttributeError):
+        # guild.emojis may not be iterable (e.g., in tests)
+        return {}
+
 def extract_emoji_tags(text: str) -> List[str]:
     """
     Extract all emoji tags from text that are enclosed in curly braces.
-    
+
     Args:
         text (str): Text to search for emoji tags
-        
+
     Returns:
         List[str]: List of emoji names found in curly braces
     """
+    # Most responses contain no tags at all; skip the regex entirely then
+    if '{' not in text:
+        return []
     logger.debug(f"Extracting emoji tags from text: {text[:100]}...")
     # Find all patterns like {emoji_name}
-    pattern = r'\{([^{}]+)\}'
-    matches = re.findall(pattern, text)
+    matches = EMOJI_TAG_PATTERN.findall(text)
     logger.debug(f"Found {len(matches)} emoji tags: {matches}")
     return matches
 
@@ -37,15 +106,13 @@ def validate_emoji_tag(emoji_name: str, guild: discord.Guild) -> bool:
     """
     logger.debug(f"Validating emoji tag: {emoji_name}")
     
-    # Check if it's a standard Unicode emoji (we'll assume all Unicode emojis are valid)
-    # This is a simplified check - in practice, you might want a more comprehensive list
-    if len(emoji_name) <= 2 and any(ord(char) > 127 for char in emoji_name):
+    # Check if it's a standard Unicode emoji
+    if is_unicode_emoji(emoji_name):
         logger.debug(f"Emoji {emoji_name} is a Unicode emoji, considered valid")
         return True
     
     # Check custom emojis in the guild
-    emoji_obj = discord.utils.get(guild.emojis, name=emoji_name)
-    is_valid = emoji_obj is not None
+    is_valid = emoji_name in _guild_emoji_map(guild)
     logger.debug(f"Emoji {emoji_name} validity: {is_valid}")
     return is_valid
 
@@ -63,12 +130,12 @@ def convert_emoji_tag_to_discord_emoji(emoji_name: str, guild: discord.Guild) ->
     logger.debug(f"Converting emoji tag to Discord emoji: {emoji_name}")
     
     # Check if it's already a Unicode emoji
-    if len(emoji_name) <= 2 and any(ord(char) > 127 for char in emoji_name):
+    if is_unicode_emoji(emoji_name):
         logger.debug(f"Emoji {emoji_name} is a Unicode emoji")
         return emoji_name
     
     # Check custom emojis in the guild
-    emoji_obj = discord.utils.get(guild.emojis, name=emoji_name)
+    emoji_obj = _guild_emoji_map(guild).get(emoji_name)
     if emoji_obj:
         discord_emoji = str(emoji_obj)
         logger.debug(f"Found custom emoji {emoji_name}: {discord_emoji}")
@@ -88,24 +155,42 @@ def replace_emoji_tags(text: str, guild: discord.Guild) -> str:
     Returns:
         str: Text with emoji tags replaced by Discord emojis
     """
+    if '{' not in text:
+        return text
+
+    # The guild's emoji set versions the cache key, so a changed emoji set
+    # naturally misses instead of serving stale replacements
+    cache_key = None
+    try:
+        fingerprint = tuple((emoji.id, emoji.name) for emoji in guild.emojis)
+        cache_key = (guild.id, fingerprint, text)
+    except (TypeError, AttributeError):
+        pass
+    if cache_key is not None:
+        cached = _replace_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     logger.debug(f"Replacing emoji tags in text: {text[:100]}...")
-    
-    def replace_match(match):
-        emoji_name = match.group(1)
-        logger.debug(f"Processing emoji tag: {emoji_name}")
-        discord_emoji = convert_emoji_tag_to_discord_emoji(emoji_name, guild)
-        if discord_emoji:
-            logger.debug(f"Replacing {emoji_name} with {discord_emoji}")
-            return discord_emoji
-        else:
-            # If emoji not found, keep the original tag
-            logger.debug(f"Emoji {emoji_name} not found, keeping original tag")
-            return match.group(0)
-    
-    # Replace all patterns like {emoji_name} with actual emojis
-    pattern = r'\{([^{}]+)\}'
-    result = re.sub(pattern, replace_match, text)
+
+    # Substitute known custom emojis in a single pass: the pattern's
+    # alternation is exactly the guild's emoji names, so the regex engine
+    # does the matching and the callback is a plain table lookup
+    entry = _guild_replacement_table(guild)
+    if entry is not None:
+        pattern, table = entry
+        result = pattern.sub(lambda m: table[m.group(1)], text) if pattern else text
+    else:
+        result = text
+
+    # Any remaining tags are Unicode emojis (unwrapped) or unknown (kept)
+    if '{' in result:
+        result = EMOJI_TAG_PATTERN.sub(_replace_unicode_or_keep, result)
     logger.debug(f"Text after emoji replacement: {result[:100]}...")
+    if cache_key is not None:
+        if len(_replace_cache) >= _REPLACE_CACHE_MAXSIZE:
+            _replace_cache.clear()
+        _replace_cache[cache_key] = result
     return result
 
 def find_invalid_emoji_tags(text: str, guild: discord.Guild) -> List[str]:
@@ -122,11 +207,15 @@ def find_invalid_emoji_tags(text: str, guild: discord.Guild) -> List[str]:
     logger.debug(f"Finding invalid emoji tags in text: {text[:100]}...")
     emoji_tags = extract_emoji_tags(text)
     invalid_tags = []
-    
+
+    # One name-set build for all tags rather than validate_emoji_tag's
+    # per-call lookup construction
+    guild_emoji_names = _guild_emoji_map(guild).keys()
     for emoji_name in emoji_tags:
-        if not validate_emoji_tag(emoji_name, guild):
-            invalid_tags.append(emoji_name)
-            logger.debug(f"Found invalid emoji tag: {emoji_name}")
+        if emoji_name in guild_emoji_names or is_unicode_emoji(emoji_name):
+            continue
+        invalid_tags.append(emoji_name)
+        logger.debug(f"Found invalid emoji tag: {emoji_name}")
     
     logger.debug(f"Found {len(invalid_tags)} invalid emoji tags: {invalid_tags}")
     return invalid_tags
@@ -141,7 +230,9 @@ def has_emoji_tags(text: str) -> bool:
     Returns:
         bool: True if text contains emoji tags, False otherwise
     """
+    if '{' not in text:
+        return False
     logger.debug(f"Checking if text has emoji tags: {text[:100]}...")
-    has_tags = bool(re.search(r'\{[^{}]+\}', text))
+    has_tags = bool(EMOJI_TAG_PATTERN.search(text))
     logger.debug(f"Text has emoji tags: {has_tags}")
     return has_tags
\ No newline at end of file
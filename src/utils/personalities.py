@@ -1,9 +1,14 @@
 # src/utils/personalities.py
 
 import os
+import pickle
+import re
+import sys
+import threading
 import tomllib
 import logging
-from glob import glob
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,22 +23,63 @@ def set_server_personality(guild_id, personality):
     """Set the current personality for a server."""
     server_personalities[guild_id] = personality
 
+# Fast-path extractors for the fixed personality schema: two top-level
+# basic strings and three [section] tables each holding one multi-line
+# content string. Anything these can't handle falls back to tomllib.
+_NAME_DESC_PATTERN = re.compile(r'^(name|description)\s*=\s*"([^"\\]*)"\s*$', re.M)
+_SECTION_CONTENT_PATTERN = re.compile(
+    r'\[(personality_traits|communication_style|behavior_patterns)\]\s*\ncontent\s*=\s*"""\n?(.*?)"""',
+    re.S
+)
+
+def _fast_parse_personality(text):
+    """
+    Extract the five personality fields with two precompiled regexes
+    instead of a full TOML parse. Returns None when the document doesn't
+    match the expected shape (e.g. uses escape sequences).
+    """
+    if "\\" in text:
+        # Escape sequences need the real parser
+        return None
+    top = dict(_NAME_DESC_PATTERN.findall(text))
+    if "name" not in top:
+        return None
+    sections = dict(_SECTION_CONTENT_PATTERN.findall(text))
+    return {
+        "name": top["name"],
+        "description": top.get("description", ""),
+        "personality_traits": sections.get("personality_traits", ""),
+        "communication_style": sections.get("communication_style", ""),
+        "behavior_patterns": sections.get("behavior_patterns", "")
+    }
+
 def load_personality_from_file(file_path):
     """Load a personality definition from a TOML file."""
     logger.debug(f"Loading personality from file: {file_path}")
     try:
-        with open(file_path, "rb") as f:
-            data = tomllib.load(f)
-            
-        # Extract the personality data
-        personality = {
-            "name": data.get("name", "Unnamed Personality"),
-            "description": data.get("description", ""),
-            "personality_traits": data.get("personality_traits", {}).get("content", ""),
-            "communication_style": data.get("communication_style", {}).get("content", ""),
-            "behavior_patterns": data.get("behavior_patterns", {}).get("content", "")
-        }
-        
+        # A buffer larger than any personality file means one read syscall
+        with open(file_path, "rb", buffering=1 << 16) as f:
+            raw = f.read()
+
+        # Try the schema-specific fast path before paying for a full parse
+        personality = None
+        try:
+            personality = _fast_parse_personality(raw.decode("utf-8"))
+        except UnicodeDecodeError:
+            personality = None
+
+        if personality is None:
+            data = tomllib.loads(raw.decode("utf-8"))
+
+            # Extract the personality data
+            personality = {
+                "name": data.get("name", "Unnamed Personality"),
+                "description": data.get("description", ""),
+                "personality_traits": data.get("personality_traits", {}).get("content", ""),
+                "communication_style": data.get("communication_style", {}).get("content", ""),
+                "behavior_patterns": data.get("behavior_patterns", {}).get("content", "")
+            }
+
         logger.debug(f"Loaded personality: {personality}")
         return personality
     except Exception as e:
@@ -45,7 +91,7 @@ def load_base_guidelines():
     guidelines_path = os.path.join(os.path.dirname(__file__), "..", "personalities", "base_guidelines.toml")
     logger.debug(f"Loading base guidelines from: {guidelines_path}")
     try:
-        with open(guidelines_path, "rb") as f:
+        with open(guidelines_path, "rb", buffering=1 << 16) as f:
             data = tomllib.load(f)
         guidelines = data.get("base_guidelines", {}).get("content", "")
         logger.debug("Base guidelines loaded successfully")
@@ -74,95 +120,214 @@ def load_base_guidelines():
         logger.debug("Using fallback base guidelines")
         return fallback_guidelines
 
+def _build_personality_prompt(personality):
+    """Assemble the full system prompt for a personality dict."""
+    # One join over a tuple; the interned BASE_GUIDELINES segment is shared
+    # across every personality instead of copied into f-string temporaries
+    return "".join((
+        "You are ", personality['name'], ", ", personality['description'], ".\n\n",
+        personality['personality_traits'], "\n\n",
+        personality['communication_style'], "\n\n",
+        personality['behavior_patterns'], "\n\n",
+        BASE_GUIDELINES, "\n"
+    ))
+
+# Parsed personalities are pickled here so warm startups skip TOML parsing;
+# the cache key is the stat signature of every .toml file
+_PICKLE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ai-adam", "personalities.pkl")
+
+def _load_personalities_pickle(cache_key):
+    """Return (base_guidelines, personalities) from the pickle cache, or None."""
+    try:
+        with open(_PICKLE_CACHE_PATH, "rb") as f:
+            stored_key, base_guidelines, personalities = pickle.load(f)
+        if stored_key == cache_key:
+            return base_guidelines, personalities
+    except Exception:
+        # Missing or corrupt cache; rebuild from the TOML files
+        pass
+    return None
+
+def _save_personalities_pickle(cache_key, base_guidelines, personalities):
+    try:
+        os.makedirs(os.path.dirname(_PICKLE_CACHE_PATH), exist_ok=True)
+        with open(_PICKLE_CACHE_PATH, "wb") as f:
+            pickle.dump((cache_key, base_guidelines, personalities), f)
+    except Exception as e:
+        logger.debug(f"Could not write personalities cache: {e}")
+
 def load_all_personalities():
     """Load all personalities from the personalities directory."""
     logger.debug("Loading all personalities")
+    global BASE_GUIDELINES
     personalities = {}
     personalities_dir = os.path.join(os.path.dirname(__file__), "..", "personalities")
     logger.debug(f"Personalities directory: {personalities_dir}")
-    
+
+    # One scandir pass for every .toml file; glob did pattern matching plus
+    # a stat per file
+    try:
+        toml_entries = [
+            entry for entry in os.scandir(personalities_dir)
+            if entry.is_file() and entry.name.endswith(".toml")
+        ]
+    except OSError as e:
+        logger.error(f"Could not scan personalities directory {personalities_dir}: {e}")
+        toml_entries = []
+
+    # Stats are far cheaper than parses: if no TOML file changed since the
+    # pickle cache was written, load the parsed dict straight from it
+    cache_key = None
+    try:
+        cache_key = tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+            for entry in toml_entries
+        ))
+    except OSError:
+        pass
+    if cache_key is not None:
+        cached = _load_personalities_pickle(cache_key)
+        if cached is not None:
+            logger.debug("Loaded personalities from pickle cache")
+            base_guidelines, personalities = cached
+            BASE_GUIDELINES = sys.intern(base_guidelines)
+            return personalities
+
     # Load base guidelines once
     logger.debug("Loading base guidelines")
     base_guidelines = load_base_guidelines()
     logger.debug("Base guidelines loaded")
-    
-    # Add base guidelines to globals
-    global BASE_GUIDELINES
-    BASE_GUIDELINES = base_guidelines
+
+    # Add base guidelines to globals, interned so every prompt shares the
+    # same underlying string object
+    BASE_GUIDELINES = sys.intern(base_guidelines)
     logger.debug("Base guidelines set globally")
-    
-    # Load all personality files
-    personality_files = glob(os.path.join(personalities_dir, "*.toml"))
+
+    personality_files = [entry for entry in toml_entries if entry.name != "base_guidelines.toml"]
     logger.debug(f"Found {len(personality_files)} personality files")
-    
-    for file_path in personality_files:
-        logger.debug(f"Processing personality file: {file_path}")
-        # Skip the base guidelines file
-        if os.path.basename(file_path) == "base_guidelines.toml":
-            logger.debug("Skipping base guidelines file")
-            continue
-            
-        personality = load_personality_from_file(file_path)
+
+    # Parse the files in a small thread pool so the blocking reads overlap;
+    # loading is sum-of-latencies serially but max-of-latencies here
+    if personality_files:
+        with ThreadPoolExecutor(max_workers=min(8, len(personality_files))) as executor:
+            loaded = list(executor.map(load_personality_from_file,
+                                       (entry.path for entry in personality_files)))
+    else:
+        loaded = []
+
+    for entry, personality in zip(personality_files, loaded):
+        logger.debug(f"Processing personality file: {entry.path}")
         if personality:
             # Extract personality name from filename (without extension)
-            personality_name = os.path.splitext(os.path.basename(file_path))[0]
+            personality_name = entry.name[:-5]
+            # Assemble the full system prompt once here so the request path
+            # is a plain dict lookup
+            personality["prompt"] = _build_personality_prompt(personality)
             personalities[personality_name] = personality
             logger.debug(f"Loaded personality '{personality_name}'")
         else:
-            logger.warning(f"Failed to load personality from {file_path}")
-    
+            logger.warning(f"Failed to load personality from {entry.path}")
+
+    if cache_key is not None:
+        _save_personalities_pickle(cache_key, base_guidelines, personalities)
+
     logger.debug(f"Loaded {len(personalities)} personalities")
     return personalities
 
-# Load all personalities at module import time
-logger.debug("Loading all personalities at module import time")
-PERSONALITIES = load_all_personalities()
-logger.debug(f"Personalities loaded at module import time: {len(PERSONALITIES)}")
+# Personalities are loaded lazily on first use rather than at import time,
+# so importing this module (e.g. from tests or tooling) doesn't pay for the
+# TOML parsing. `from ... import PERSONALITIES` still works via the module
+# __getattr__ below.
+_PERSONALITIES = None
+_personalities_lock = threading.Lock()
+
+def _get_personalities():
+    """Load personalities on first use, thread-safely."""
+    global _PERSONALITIES
+    if _PERSONALITIES is None:
+        with _personalities_lock:
+            if _PERSONALITIES is None:
+                logger.debug("Loading all personalities on first use")
+                _PERSONALITIES = load_all_personalities()
+                _warm_prompt_cache()
+    return _PERSONALITIES
+
+def __getattr__(name):
+    # PEP 562: resolve the lazily-built module globals on attribute access
+    if name == "PERSONALITIES":
+        return _get_personalities()
+    if name == "BASE_GUIDELINES":
+        _get_personalities()
+        return globals()["BASE_GUIDELINES"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Fallback when neither the requested personality nor "default" is loaded
+_DEFAULT_PERSONALITY = {
+    "name": "Default Assistant",
+    "description": "A helpful AI assistant",
+    "personality_traits": "",
+    "communication_style": "",
+    "behavior_patterns": ""
+}
 
+@lru_cache(maxsize=64)
 def get_personality(personality_name="default"):
-    """Get the personality definition by name, defaulting to 'default' if not found."""
-    logger.debug(f"Getting personality: {personality_name}")
-    personality = PERSONALITIES.get(personality_name, PERSONALITIES.get("default", {
-        "name": "Default Assistant",
-        "description": "A helpful AI assistant",
-        "personality_traits": "",
-        "communication_style": "",
-        "behavior_patterns": ""
-    }))
-    logger.debug(f"Retrieved personality: {personality}")
+    """Get the personality definition by name, defaulting to 'default' if not found.
+
+    Memoized alongside get_personality_prompt; register_personality clears
+    both caches.
+    """
+    personalities = _get_personalities()
+    personality = personalities.get(personality_name)
+    if personality is None:
+        personality = personalities.get("default", _DEFAULT_PERSONALITY)
     return personality
 
+# Cached view of the personality names; rebuilt after register. Kept as a
+# list because that is the documented return type; callers must not mutate.
+_available_names = None
+
 def get_available_personalities():
     """Get a list of available personality names."""
-    personalities = list(PERSONALITIES.keys())
-    logger.debug(f"Available personalities: {personalities}")
-    return personalities
+    global _available_names
+    if _available_names is None:
+        _available_names = list(_get_personalities().keys())
+    return _available_names
 
+@lru_cache(maxsize=None)
 def get_personality_prompt(personality_name="default"):
-    """Get the system prompt for a specific personality."""
-    logger.debug(f"Getting personality prompt for: {personality_name}")
-    personality = get_personality(personality_name)
-    logger.debug(f"Personality data: {personality}")
-    
-    # Build the complete prompt with base guidelines
-    prompt = f"""You are {personality['name']}, {personality['description']}.
-    
-{personality['personality_traits']}
-
-{personality['communication_style']}
+    """Get the system prompt for a specific personality.
 
-{personality['behavior_patterns']}
+    Memoized: the prompt is rebuilt only when the cache is cleared (e.g.
+    after register_personality), not on every message.
+    """
+    personality = get_personality(personality_name)
 
-{BASE_GUIDELINES}
-"""
-    logger.debug(f"Generated personality prompt (first 200 chars): {prompt[:200]}...")
+    # Prompts are precomputed at load time; build one on the fly only for
+    # personalities registered without a "prompt" key
+    prompt = personality.get("prompt")
+    if prompt is None:
+        prompt = _build_personality_prompt(personality)
     return prompt
 
+def _warm_prompt_cache():
+    """Build every personality prompt up front so the first message in each
+    personality doesn't pay for prompt assembly. Runs right after the lazy
+    load completes."""
+    get_personality_prompt()
+    for personality_name in _get_personalities():
+        get_personality_prompt(personality_name)
+
 def register_personality(name, personality_data):
     """Register a new personality."""
     logger.debug(f"Registering new personality: {name}")
     logger.debug(f"Personality data: {personality_data}")
-    PERSONALITIES[name] = personality_data
+    _get_personalities()[name] = personality_data
+    # Drop memoized lookups so the new definition takes effect
+    global _available_names
+    _available_names = None
+    get_personality.cache_clear()
+    get_personality_prompt.cache_clear()
     logger.debug(f"Personality '{name}' registered successfully")
 
 def create_personality_template(name, description):
@@ -1,6 +1,9 @@
+import asyncio
 import os
 import sys
 
+import pytest
+
 
 def _ensure_repo_root_on_path() -> None:
     """Ensure project root (containing the `src` package) is importable.
@@ -19,3 +22,59 @@ _ensure_repo_root_on_path()
 
 # Ensure test-mode behavior is enabled where code gates on TEST_ENV
 os.environ.setdefault("TEST_ENV", "1")
+
+
+@pytest.fixture(autouse=True)
+def _clear_module_caches():
+    """Reset module-level caches between tests.
+
+    Tests reuse the same mock guild/user ids, and several caches have TTLs
+    longer than a suite run, so a value cached by one test (often against a
+    patched db_manager) must not satisfy the lookup in the next.
+    """
+
+    from src.utils.emoji_analyzer import _description_cache
+
+    _description_cache.clear()
+
+    # src.main's caches only matter if a test already imported it; don't
+    # force the import (it builds the bot) for tests that never touch it
+    main = sys.modules.get("src.main")
+    if main is not None:
+        main._emoji_prompt_cache.clear()
+        main._passive_last_write.clear()
+        main._personality_prompt_cached.cache_clear()
+    yield
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run the async tests under uvloop when it's installed.
+
+    uvloop's C event loop cuts per-await scheduling overhead across the
+    suite; it is optional and unavailable on Windows, so the default
+    policy is the fallback rather than a hard dependency.
+    """
+
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def main_module():
+    """Import src.main once for the whole session.
+
+    Python caches the import anyway, but going through this fixture keeps
+    the per-test `import src.main` boilerplate out of config/env tests and
+    gives them one obvious place to read module attributes from.
+    """
+
+    import src.main
+
+    return src.main
@@ -1,12 +1,8 @@
-import sys
-import os
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 import json
 import asyncio
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Helper class for async iterator
 class AsyncIterator:
@@ -85,7 +81,7 @@ async def test_comprehensive_bot_integration():
     interactions = []
     
     # Mock litellm.completion to capture prompts and return realistic responses
-    def mock_completion(model, messages):
+    def mock_completion(model, messages, **kwargs):
         prompt = messages[0]['content']
         interactions.append({
             'prompt': prompt,
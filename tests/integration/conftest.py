@@ -0,0 +1,13 @@
+import pytest
+
+
+def _make_llm_response(content: str) -> dict:
+    """Build a LiteLLM-shaped completion response around one message."""
+    return {'choices': [{'message': {'content': content}}]}
+
+
+@pytest.fixture(scope="session")
+def make_llm_response():
+    """The response builder, shared so tests stop hand-rolling the
+    choices/message/content nesting and the shape lives in one place."""
+    return _make_llm_response
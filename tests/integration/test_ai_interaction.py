@@ -1,178 +1,116 @@
-import sys
-import os
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Memory payloads returned by the db stubs; built once for the module
+_EMPTY_USER_MEMORY = {"known_facts": "{}", "interaction_history": "[]"}
+_EMPTY_SERVER_MEMORY = {"known_facts": "{}"}
+
+def _ret(value):
+    """A plain coroutine stub for db calls no test asserts on.
+
+    Cheaper than AsyncMock, which builds a _Call record per await; keep
+    AsyncMock for stubs whose call counts the tests check.
+    """
+    async def _stub(*args, **kwargs):
+        return value
+    return _stub
 
 @pytest.fixture
 def mock_message():
-    """Create a mock Discord message for testing."""
+    """Create a mock Discord message for testing.
+
+    Function-scoped on purpose: tests mutate author/mentions/mention_everyone.
+    """
     mock_author = Mock()
     mock_author.id = "123456789"
     mock_author.mention = "<@123456789>"
-    
+
     mock_channel = AsyncMock()
-    
+
     mock_message = Mock()
     mock_message.author = mock_author
     mock_message.channel = mock_channel
     mock_message.content = "Hello, how are you?"
-    
+
     return mock_message
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_bot_user():
-    """Create a mock bot user for testing."""
+    """Create a mock bot user, shared across the module (only its
+    mentioned_in stub is reassigned per test)."""
     mock_bot_user = Mock()
     mock_bot_user.id = "987654321"
     return mock_bot_user
 
-@pytest.mark.asyncio
-async def test_on_message_ignores_bot_messages(mock_message, mock_bot_user):
-    """Test that the bot ignores messages from itself."""
-    # Import the main module dynamically to avoid import issues
+@pytest.fixture
+def mock_bot(mock_bot_user, monkeypatch):
+    """Install a mock bot on src.main for the duration of a test."""
     import src.main
-    
-    # Create a mock bot and set its user property
-    mock_bot = Mock()
-    mock_bot.process_commands = AsyncMock()
-    type(mock_bot).user = mock_bot_user
-    src.main.bot = mock_bot
-    
-    # Set the message author to the bot user
-    mock_message.author = mock_bot_user
-    
-    # Mock the mentioned_in method to return False
-    mock_bot_user.mentioned_in = Mock(return_value=False)
-    
-    # Mock message mentions
-    mock_message.mentions = []
-    
-    # Call the on_message function
-    with patch('src.main.db_manager') as mock_db_manager:
-        await src.main.on_message(mock_message)
-        
-        # The database manager should not be called
-        mock_db_manager.get_user_memory.assert_not_called()
 
-@pytest.mark.asyncio
-async def test_on_message_handles_exceptions(mock_message, mock_bot_user):
-    """Test that the bot handles exceptions gracefully."""
-    # Import the main module dynamically to avoid import issues
-    import src.main
-    
-    # Create a mock bot and set its user property
     mock_bot = Mock()
     mock_bot.process_commands = AsyncMock()
     mock_bot.user = mock_bot_user
-    src.main.bot = mock_bot
-    
-    # Mock the mentioned_in method to return True
-    mock_bot_user.mentioned_in = Mock(return_value=True)
-    
-    # Mock message mentions
-    mock_message.mentions = []
-    
-    # Mock the database manager to return some memory
-    with patch('src.main.db_manager') as mock_db_manager:
-        mock_db_manager.update_user_memory = AsyncMock()
-        mock_db_manager.get_user_memory = AsyncMock(return_value={"known_facts": "{}", "interaction_history": "[]"})
-        mock_db_manager.get_server_memory = AsyncMock(return_value={"known_facts": "{}"})
-        
-        # Mock litellm.completion to raise an exception
-        with patch('src.main.litellm.completion', side_effect=Exception("Test error")):
-            await src.main.on_message(mock_message)
-            
-            # Check that the error message was sent
-            mock_message.channel.send.assert_called_with("Sorry, I encountered an error processing your request.")
+    monkeypatch.setattr(src.main, "bot", mock_bot)
+    return mock_bot
 
 @pytest.mark.asyncio
-async def test_on_message_processes_user_message(mock_message, mock_bot_user):
-    """Test that the bot processes user messages correctly."""
+@pytest.mark.parametrize(
+    "author_is_bot,mention_everyone,completion_fails,expected_send,expected_update_count",
+    [
+        pytest.param(True, False, False, None, 0, id="ignores_bot_messages"),
+        pytest.param(False, False, True,
+                     "Sorry, I encountered an error processing your request.", None,
+                     id="handles_exceptions"),
+        pytest.param(False, False, False,
+                     "Hello! I am doing well, thank you for asking.", 2,
+                     id="processes_user_message"),
+        pytest.param(False, True, False, None, 1, id="ignores_everyone_mentions"),
+    ],
+)
+async def test_on_message(mock_message, mock_bot_user, mock_bot, make_llm_response,
+                          author_is_bot, mention_everyone, completion_fails,
+                          expected_send, expected_update_count):
+    """Exercise the on_message paths: own messages and @everyone are ignored,
+    normal mentions get a reply, and LLM failures send an apology."""
     # Import the main module dynamically to avoid import issues
     import src.main
-    
-    # Create a mock bot and set its user property
-    mock_bot = Mock()
-    mock_bot.process_commands = AsyncMock()
-    mock_bot.user = mock_bot_user
-    src.main.bot = mock_bot
-    
-    # Mock the mentioned_in method to return True
-    mock_bot_user.mentioned_in = Mock(return_value=True)
-    
-    # Mock message mentions
-    mock_message.mentions = []
-    
-    # Mock the database manager
-    with patch('src.main.db_manager') as mock_db_manager:
-        mock_db_manager.update_user_memory = AsyncMock()
-        mock_db_manager.get_user_memory = AsyncMock(return_value={"known_facts": "{}", "interaction_history": "[]"})
-        mock_db_manager.get_server_memory = AsyncMock(return_value={"known_facts": "{}"})
-        
-        # Mock litellm.completion to return a response
-        mock_response = {
-            'choices': [{
-                'message': {
-                    'content': 'Hello! I am doing well, thank you for asking.'
-                }
-            }]
-        }
-        with patch('src.main.litellm.completion', return_value=mock_response):
-            await src.main.on_message(mock_message)
-            
-            # Check that the response was sent
-            mock_message.channel.send.assert_called_with('Hello! I am doing well, thank you for asking.')
-            
-            # Check that the database was updated twice (once for learning, once for response)
-            assert mock_db_manager.update_user_memory.call_count == 2
 
-@pytest.mark.asyncio
-async def test_on_message_ignores_everyone_mentions(mock_message, mock_bot_user):
-    """Test that the bot ignores @everyone mentions."""
-    # Import the main module dynamically to avoid import issues
-    import src.main
-    
-    # Create a mock bot and set its user property
-    mock_bot = Mock()
-    mock_bot.process_commands = AsyncMock()
-    mock_bot.user = mock_bot_user
-    src.main.bot = mock_bot
-    
-    # Mock the mentioned_in method to return True (mentioned)
-    mock_bot_user.mentioned_in = Mock(return_value=True)
-    
-    # Set mention_everyone to True to simulate @everyone
-    mock_message.mention_everyone = True
-    
-    # Mock message mentions
+    if author_is_bot:
+        # Set the message author to the bot user
+        mock_message.author = mock_bot_user
+    mock_bot_user.mentioned_in = Mock(return_value=not author_is_bot)
+    mock_message.mention_everyone = mention_everyone
     mock_message.mentions = []
-    
-    # Mock the database manager
+
+    mock_response = make_llm_response('Hello! I am doing well, thank you for asking.')
+    completion_kwargs = (
+        {'side_effect': Exception("Test error")} if completion_fails
+        else {'return_value': mock_response}
+    )
+
     with patch('src.main.db_manager') as mock_db_manager:
+        # update_user_memory and get_user_memory stay AsyncMock because the
+        # assertions below inspect their call records
         mock_db_manager.update_user_memory = AsyncMock()
-        mock_db_manager.get_user_memory = AsyncMock(return_value={"known_facts": "{}", "interaction_history": "[]"})
-        mock_db_manager.get_server_memory = AsyncMock(return_value={"known_facts": "{}"})
-        
-        # Mock litellm.completion to return a response
-        mock_response = {
-            'choices': [{
-                'message': {
-                    'content': 'Hello! I am doing well, thank you for asking.'
-                }
-            }]
-        }
-        with patch('src.main.litellm.completion', return_value=mock_response):
+        mock_db_manager.get_user_memory = AsyncMock(return_value=_EMPTY_USER_MEMORY)
+        mock_db_manager.get_server_memory = _ret(_EMPTY_SERVER_MEMORY)
+
+        with patch('src.main.litellm.completion', **completion_kwargs):
             await src.main.on_message(mock_message)
-            
-            # Check that the response was NOT sent (bot should ignore @everyone)
+
+        if author_is_bot:
+            # The database manager should not be touched for the bot's own messages
+            mock_db_manager.get_user_memory.assert_not_called()
+
+        if expected_send is None:
             mock_message.channel.send.assert_not_called()
-            
-            # Check that the database was only updated once for learning, not for response
-            assert mock_db_manager.update_user_memory.call_count == 1
+        else:
+            mock_message.channel.send.assert_called_with(expected_send)
+
+        if expected_update_count is not None:
+            assert mock_db_manager.update_user_memory.call_count == expected_update_count
 
 def test_llm_env_vars_complete():
     """Test that the LLM environment variables list is comprehensive."""
@@ -43,7 +43,7 @@ class TestEmojiSystem:
         assert invalid_emojis == []
     
     @pytest.mark.asyncio
-    async def test_ai_response_validation_and_retry(self):
+    async def test_ai_response_validation_and_retry(self, make_llm_response):
         """Test the complete AI response validation and retry system."""
         # Create a mock guild with emojis
         mock_emoji = Mock()
@@ -65,13 +65,7 @@ class TestEmojiSystem:
         
         # Mock the litellm.completion to return a corrected response
         with patch('src.utils.ai_response_validator.litellm') as mock_litellm:
-            mock_litellm.completion.return_value = {
-                'choices': [{
-                    'message': {
-                        'content': 'Hello {smile} world'
-                    }
-                }]
-            }
+            mock_litellm.completion.return_value = make_llm_response('Hello {smile} world')
             
             result_text, was_retried = await validate_and_retry_ai_response(
                 response_text, mock_guild, config, original_prompt
@@ -82,7 +76,7 @@ class TestEmojiSystem:
             assert was_retried == True
     
     @pytest.mark.asyncio
-    async def test_complete_emoji_system_integration(self):
+    async def test_complete_emoji_system_integration(self, make_llm_response):
         """Test the complete emoji system integration."""
         # Create a mock guild with emojis
         mock_emoji = Mock()
@@ -105,13 +99,7 @@ class TestEmojiSystem:
         
         # Mock the litellm.completion to return a corrected response
         with patch('src.utils.ai_response_validator.litellm') as mock_litellm:
-            mock_litellm.completion.return_value = {
-                'choices': [{
-                    'message': {
-                        'content': 'Hello {smile} world! 👍'
-                    }
-                }]
-            }
+            mock_litellm.completion.return_value = make_llm_response('Hello {smile} world! 👍')
             
             # First validate and retry
             corrected_text, was_retried = await validate_and_retry_ai_response(
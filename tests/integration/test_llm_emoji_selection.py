@@ -1,11 +1,6 @@
 import pytest
 import discord
 from unittest.mock import AsyncMock, MagicMock, patch
-import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from src.cogs.reactions import ReactionCog
 
@@ -25,7 +20,7 @@ class TestLLMEmojiSelection:
         return ReactionCog(bot)
 
     @pytest.mark.asyncio
-    async def test_explicit_emoji_request_uses_llm(self, reaction_cog):
+    async def test_explicit_emoji_request_uses_llm(self, reaction_cog, make_llm_response):
         """Test that explicit emoji requests are handled by the LLM, not pattern matching"""
         # Create a mock message with an explicit emoji request
         mock_message = MagicMock()
@@ -42,13 +37,7 @@ class TestLLMEmojiSelection:
                 # Mock get_relevant_context to return empty string
                 with patch.object(reaction_cog, 'get_relevant_context', return_value=""):
                     # Mock the LLM response for emoji selection
-                    mock_completion.return_value = {
-                        'choices': [{
-                            'message': {
-                                'content': '["👷"]'
-                            }
-                        }]
-                    }
+                    mock_completion.return_value = make_llm_response('["👷"]')
                     
                     # Call the method
                     reactions = await reaction_cog.get_appropriate_reaction_emojis(mock_message)
@@ -59,23 +48,5 @@ class TestLLMEmojiSelection:
                     # Verify that we got the expected emoji (construction worker)
                     assert reactions == ["👷"]
 
-    @pytest.mark.asyncio
-    async def test_emoji_selection_fallback(self, reaction_cog):
-        """Test that emoji selection falls back properly when LLM fails"""
-        # Create a mock message
-        mock_message = MagicMock()
-        mock_message.content = "please react to this with a construction worker emoji"
-        mock_message.guild = MagicMock()
-        mock_message.guild.emojis = []
-        mock_message.author = MagicMock()
-        mock_message.author.bot = False
-
-        # Mock the LLM to fail
-        with patch('litellm.completion', side_effect=Exception("LLM Error")):
-            # Mock should_react_to_message to return True
-            with patch.object(reaction_cog, 'should_react_to_message', return_value=True):
-                # Call the method
-                reactions = await reaction_cog.get_appropriate_reaction_emojis(mock_message)
-                
-                # Verify that we got the fallback emoji
-                assert reactions == ["👍"]
\ No newline at end of file
+    # The LLM-failure fallback case lives with the other fallback cases in
+    # test_reactions_comprehensive.test_get_appropriate_reaction_emojis_fallback
\ No newline at end of file
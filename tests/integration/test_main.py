@@ -1,33 +1,23 @@
-import sys
-import os
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-def test_environment_variables_loaded():
+def test_environment_variables_loaded(main_module):
     """Test that environment variables are loaded."""
-    # Import the main module dynamically to avoid import issues
-    import src.main
-    
     # The DISCORD_TOKEN should be set
-    assert src.main.DISCORD_TOKEN is not None
-    assert isinstance(src.main.DISCORD_TOKEN, str)
+    assert main_module.DISCORD_TOKEN is not None
+    assert isinstance(main_module.DISCORD_TOKEN, str)
 
-def test_config_loaded():
+def test_config_loaded(main_module):
     """Test that the config file is loaded correctly."""
-    # Import the main module dynamically to avoid import issues
-    import src.main
-    
     # The config should be loaded
-    assert src.main.config is not None
+    assert main_module.config is not None
     # Should have the expected sections
-    assert 'discord' in src.main.config
-    assert 'ai' in src.main.config
-    assert 'database' in src.main.config
-    assert 'logging' in src.main.config
+    assert 'discord' in main_module.config
+    assert 'ai' in main_module.config
+    assert 'database' in main_module.config
+    assert 'logging' in main_module.config
 
 @patch('builtins.exit')
 def test_config_file_not_found(mock_exit):
@@ -36,12 +26,9 @@ def test_config_file_not_found(mock_exit):
     # FileNotFoundError is handled in the actual code
     # This test ensures we've considered the case in our code
 
-def test_litellm_environment_variables():
+def test_litellm_environment_variables(main_module):
     """Test that LiteLLM environment variables are set."""
-    # Import the main module dynamically to avoid import issues
-    import src.main
-    
     # At least some of the common LLM environment variables should be in our list
     expected_vars = ['OPENAI_API_KEY', 'ANTHROPIC_API_KEY', 'GOOGLE_API_KEY']
     for var in expected_vars:
-        assert var in src.main.llm_env_vars
\ No newline at end of file
+        assert var in main_module.llm_env_vars
\ No newline at end of file
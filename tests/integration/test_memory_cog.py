@@ -1,19 +1,13 @@
-import sys
-import os
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 import json
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import src.cogs.memory
+
 
 def test_memory_cog_import():
     """Test that the memory cog can be imported correctly."""
-    try:
-        import src.cogs.memory
-        assert src.cogs.memory is not None
-    except ImportError as e:
-        pytest.fail(f"Failed to import Memory cog: {e}")
+    assert src.cogs.memory is not None
 
 def test_memory_cog_setup():
     """Test that the memory cog setup works correctly."""
@@ -22,8 +16,7 @@ def test_memory_cog_setup():
     mock_db_manager = AsyncMock()
     mock_bot.db_manager = mock_db_manager
     
-    # Import and set up the memory cog
-    import src.cogs.memory
+    # Set up the memory cog
     src.cogs.memory.setup(mock_bot)
     
     # Verify that the slash_command decorator was called
@@ -2,13 +2,9 @@
 Additional comprehensive tests for the personality system edge cases.
 """
 
-import sys
-import os
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 def test_get_personality_with_invalid_name():
     """Test that get_personality returns the default personality when given an invalid name."""
@@ -3,16 +3,12 @@ Integration test to verify that personalities are correctly applied in the AI re
 This test verifies the fix for the issue where personalities were not being applied.
 """
 
-import sys
-import os
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 @pytest.mark.asyncio
-async def test_personality_applied_in_ai_response():
+async def test_personality_applied_in_ai_response(make_llm_response):
     """
     Test that when a personality is set for a server, 
     it is correctly used in the AI response generation.
@@ -63,15 +59,9 @@ async def test_personality_applied_in_ai_response():
 
         # Mock litellm.completion to capture the prompt and return a mock response
         captured_prompt = {}
-        def capture_prompt(model, messages):
+        def capture_prompt(model, messages, **kwargs):
             captured_prompt['prompt'] = messages[0]['content']
-            return {
-                'choices': [{
-                    'message': {
-                        'content': 'I am a tech expert AI assistant.'
-                    }
-                }]
-            }
+            return make_llm_response('I am a tech expert AI assistant.')
 
         with patch('src.main.litellm.completion', side_effect=capture_prompt):
             # Mock emoji analyzer
@@ -1,13 +1,9 @@
-import sys
-import os
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 @pytest.mark.asyncio
-async def test_personality_integration():
+async def test_personality_integration(make_llm_response):
     """Test that the personality system works correctly with the message processing."""
     # Import the main module dynamically to avoid import issues
     import src.main
@@ -53,15 +49,9 @@ async def test_personality_integration():
         
         # Mock litellm.completion to capture the prompt
         captured_prompt = {}
-        def capture_prompt(model, messages):
+        def capture_prompt(model, messages, **kwargs):
             captured_prompt['prompt'] = messages[0]['content']
-            return {
-                'choices': [{
-                    'message': {
-                        'content': 'I am a tech expert AI assistant.'
-                    }
-                }]
-            }
+            return make_llm_response('I am a tech expert AI assistant.')
         
         with patch('src.main.litellm.completion', side_effect=capture_prompt):
             # Mock emoji analyzer
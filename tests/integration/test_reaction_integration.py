@@ -1,11 +1,7 @@
-import sys
-import os
 import unittest
 from unittest.mock import Mock, AsyncMock, patch
 import discord
 
-# Add the project root directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 class TestReactionIntegration(unittest.TestCase):
     def test_reaction_cog_registration(self):
@@ -3,7 +3,7 @@
 import pytest
 from unittest.mock import Mock, patch
 import asyncio
-from src.utils.ai_response_validator import validate_and_retry_ai_response
+from src.utils.ai_response_validator import validate_and_retry_ai_response, validate_and_retry_ai_responses
 
 # Mock the litellm module
 @pytest.fixture
@@ -105,7 +105,59 @@ class TestAIResponseValidator:
         response_text = "Hello {invalid} world"
         original_prompt = "Say hello"
         
-        # Mock the litellm.completion response to always return invalid emojis
+        # Mock the litellm.completion response to return different but still
+        # invalid responses (identical responses would short-circuit the loop)
+        mock_litellm.completion.side_effect = [
+            {
+                'choices': [{
+                    'message': {
+                        'content': 'Hello {still_invalid} world'
+                    }
+                }]
+            },
+            {
+                'choices': [{
+                    'message': {
+                        'content': 'Hello {also_invalid} world'
+                    }
+                }]
+            }
+        ]
+
+        # Call the function with max_retries=2
+        result_text, was_retried = await validate_and_retry_ai_response(
+            response_text, mock_guild, config, original_prompt, max_retries=2
+        )
+
+        # After 2 retries the remaining invalid tag is stripped deterministically
+        assert result_text == "Hello world"
+        assert was_retried == True
+
+        # Verify that litellm.completion was called 2 times (max_retries)
+        assert mock_litellm.completion.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_validate_and_retry_ai_response_identical_retry_short_circuit(self, mock_litellm):
+        """Test that the retry loop stops when the model repeats the same response."""
+        # Create a mock guild with emojis
+        mock_emoji = Mock()
+        mock_emoji.name = "smile"
+
+        mock_guild = Mock()
+        mock_guild.emojis = [mock_emoji]
+
+        # Configuration
+        config = {
+            'ai': {
+                'default_model': 'test-model'
+            }
+        }
+
+        # Response with invalid emoji
+        response_text = "Hello {invalid} world"
+        original_prompt = "Say hello"
+
+        # Mock the litellm.completion response to repeat the original response
         mock_litellm.completion.return_value = {
             'choices': [{
                 'message': {
@@ -113,18 +165,59 @@ class TestAIResponseValidator:
                 }
             }]
         }
-        
-        # Call the function with max_retries=2
+
+        # Call the function with max_retries=3
         result_text, was_retried = await validate_and_retry_ai_response(
-            response_text, mock_guild, config, original_prompt, max_retries=2
+            response_text, mock_guild, config, original_prompt, max_retries=3
         )
-        
-        # Should return the last response after 2 retries
-        assert result_text == "Hello {invalid} world"
+
+        # Should stop after the first identical retry, with the invalid tag
+        # stripped from the final response
+        assert result_text == "Hello world"
         assert was_retried == True
-        
-        # Verify that litellm.completion was called 2 times (max_retries)
-        assert mock_litellm.completion.call_count == 2
+
+        # Only one call should be made despite max_retries=3
+        mock_litellm.completion.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_validate_and_retry_ai_responses_batches_invalid(self, mock_litellm):
+        """Test that several invalid responses are fixed with one batched call."""
+        # Create a mock guild with emojis
+        mock_emoji = Mock()
+        mock_emoji.name = "smile"
+
+        mock_guild = Mock()
+        mock_guild.emojis = [mock_emoji]
+
+        # Configuration
+        config = {
+            'ai': {
+                'default_model': 'test-model'
+            }
+        }
+
+        responses = [
+            "Hello {smile} world",      # valid, should pass through untouched
+            "Hello {invalid} world",    # needs a retry
+            "Bye {also_invalid} now",   # needs a retry
+        ]
+        prompts = ["Say hello", "Say hello", "Say bye"]
+
+        # One batch_completion call returns fixes for both invalid responses
+        mock_litellm.batch_completion.return_value = [
+            {'choices': [{'message': {'content': 'Hello {smile} world'}}]},
+            {'choices': [{'message': {'content': 'Bye {smile} now'}}]}
+        ]
+
+        results = await validate_and_retry_ai_responses(responses, mock_guild, config, prompts)
+
+        assert results[0] == ("Hello {smile} world", False)
+        assert results[1] == ("Hello {smile} world", True)
+        assert results[2] == ("Bye {smile} now", True)
+
+        # The two invalid responses share a single batched call
+        mock_litellm.batch_completion.assert_called_once()
+        assert len(mock_litellm.batch_completion.call_args.kwargs['messages']) == 2
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -1,14 +1,9 @@
-import sys
 import os
 import asyncio
 import tempfile
 import pytest
 import pytest_asyncio
 
-# Add the 'src' directory to the Python path so imports work correctly
-# when running this script directly.
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from src.database.manager import DatabaseManager
 
 @pytest_asyncio.fixture
@@ -25,7 +20,8 @@ async def db_manager():
     
     yield manager
     
-    # Clean up the temporary database file after tests
+    # Close the shared connection, then remove the temporary database file
+    await manager.close()
     os.unlink(temp_db.name)
 
 @pytest.mark.asyncio
@@ -42,6 +38,26 @@ async def test_get_user_memory_new_user(db_manager):
     # Should return default empty memory
     assert user_memory == {"known_facts": "{}", "interaction_history": "[]"}
 
+@pytest.mark.asyncio
+async def test_get_user_memories_batch(db_manager):
+    # Store memory for one user; the other should fall back to defaults
+    interaction = {"user_message": "Hello", "ai_response": "Hi there!"}
+    await db_manager.update_user_memory("111", interaction=interaction)
+
+    memories = await db_manager.get_user_memories(["111", "222"])
+
+    # Both requested users should be present
+    assert set(memories.keys()) == {"111", "222"}
+
+    # The stored user has the interaction, the unknown user has defaults
+    import json
+    history = json.loads(memories["111"]["interaction_history"])
+    assert history == [interaction]
+    assert memories["222"] == {"known_facts": "{}", "interaction_history": "[]"}
+
+    # An empty request returns an empty result without touching the database
+    assert await db_manager.get_user_memories([]) == {}
+
 @pytest.mark.asyncio
 async def test_update_and_get_user_memory(db_manager):
     user_id = "987654321"
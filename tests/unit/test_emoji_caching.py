@@ -1,10 +1,6 @@
-import sys
-import os
 import pytest
 from unittest.mock import Mock, AsyncMock
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 def test_emoji_manager_import():
     """Test that the emoji manager can be imported correctly."""
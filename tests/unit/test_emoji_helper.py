@@ -1,25 +1,17 @@
-import sys
-import os
 import pytest
 from unittest.mock import Mock
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.emoji_helper import get_server_emojis, get_random_emojis, create_emoji_prompt
+
 
 def test_emoji_helper_import():
     """Test that the emoji helper can be imported correctly."""
-    try:
-        from src.utils.emoji_helper import get_server_emojis, get_random_emojis, create_emoji_prompt
-        assert get_server_emojis is not None
-        assert get_random_emojis is not None
-        assert create_emoji_prompt is not None
-    except ImportError as e:
-        pytest.fail(f"Failed to import emoji helper: {e}")
+    assert get_server_emojis is not None
+    assert get_random_emojis is not None
+    assert create_emoji_prompt is not None
 
 def test_get_server_emojis():
     """Test getting server emojis."""
-    from src.utils.emoji_helper import get_server_emojis
-
     # Test with None guild
     assert get_server_emojis(None) == []
 
@@ -42,8 +34,6 @@ def test_get_server_emojis():
 
 def test_get_random_emojis():
     """Test getting random emojis."""
-    from src.utils.emoji_helper import get_random_emojis
-
     # Test with None guild
     assert get_random_emojis(None) == []
 
@@ -70,10 +60,27 @@ def test_get_random_emojis():
     for emoji in result:
         assert emoji in ["{test1}", "{test2}", "{test3}"]
 
+def test_get_server_emojis_cached_per_guild():
+    """Test that the formatted emoji list is reused until the emojis change."""
+    mock_emoji1 = Mock()
+    mock_emoji1.name = "test1"
+    mock_emoji1.id = "12345"
+
+    mock_guild = Mock()
+    mock_guild.emojis = [mock_emoji1]
+
+    # Same guild and emoji set: the cached list is returned as-is
+    assert get_server_emojis(mock_guild) is get_server_emojis(mock_guild)
+
+    # Changing the emoji set misses the cache and rebuilds
+    mock_emoji2 = Mock()
+    mock_emoji2.name = "test2"
+    mock_emoji2.id = "67890"
+    mock_guild.emojis = [mock_emoji1, mock_emoji2]
+    assert get_server_emojis(mock_guild) == ["{test1}", "{test2}"]
+
 def test_create_emoji_prompt():
     """Test creating emoji prompt."""
-    from src.utils.emoji_helper import create_emoji_prompt
-
     # Test with None guild
     assert create_emoji_prompt(None) == ""
 
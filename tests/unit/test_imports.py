@@ -1,11 +1,6 @@
 # tests/test_imports.py
 
-import sys
-import os
 
-# Add the project root directory to the Python path so imports work correctly
-# when running this script directly.
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 # Now try to import the main modules of the project
 try:
@@ -1,4 +1,3 @@
-import sys
 import os
 import pytest
 import pytest_asyncio
@@ -6,9 +5,6 @@ import json
 import tempfile
 from unittest.mock import AsyncMock, Mock, patch
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from src.database.manager import DatabaseManager
 
 @pytest_asyncio.fixture
@@ -25,7 +21,8 @@ async def db_manager():
     
     yield manager
     
-    # Clean up the temporary database file after tests
+    # Close the shared connection, then remove the temporary database file
+    await manager.close()
     os.unlink(temp_db.name)
 
 @pytest.mark.asyncio
@@ -1,11 +1,7 @@
-import sys
-import os
 import pytest
 import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 @pytest.fixture
 def mock_message():
@@ -1,9 +1,5 @@
-import sys
-import os
 import pytest
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 def test_personality_loading():
     """Test that personalities can be loaded correctly."""
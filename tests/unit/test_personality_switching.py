@@ -2,13 +2,9 @@
 Tests for the personality switching functionality in main.py.
 """
 
-import sys
-import os
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 
-# Add the 'src' directory to the Python path so imports work correctly
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 def test_personality_switching_functions():
     """Test that the personality switching functions in main.py work correctly."""
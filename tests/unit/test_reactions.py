@@ -1,13 +1,8 @@
-import sys
-import os
 import unittest
 from unittest.mock import Mock, AsyncMock, patch
 import discord
 import json
 
-# Add the project root directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
 from src.cogs.reactions import ReactionCog
 
 class TestReactionCog(unittest.TestCase):